@@ -0,0 +1,117 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# A batch task converts one file and returns (rows read, output path or None).
+BatchTask = Callable[[Path], Tuple[int, Optional[Path]]]
+
+
+class BatchResult(NamedTuple):
+    path: Path
+    out_path: Optional[Path]
+    rows: int
+    seconds: float
+    error: Optional[str]
+
+
+def count_rows(wb_json: Dict[str, Any]) -> int:
+    total = 0
+    for sheet in wb_json.get("sheets", {}).values():
+        for t in sheet.get("tables", []):
+            total += t.get("row_count") or 0
+    return total
+
+
+def add_batch_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes, one workbook per task (0 = one per CPU core)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only convert new or changed inputs and prune orphaned outputs",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="write JSON without indentation",
+    )
+
+
+def resolve_workers(workers: int, n_files: int) -> int:
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, n_files))
+
+
+def run_task(task: BatchTask, path: Path) -> BatchResult:
+    t0 = time.perf_counter()
+    try:
+        rows, out_path = task(path)
+    except Exception as e:
+        return BatchResult(
+            path, None, 0, time.perf_counter() - t0, f"{type(e).__name__}: {e}"
+        )
+    return BatchResult(path, out_path, rows, time.perf_counter() - t0, None)
+
+
+def report_result(result: BatchResult) -> None:
+    if result.error is not None:
+        print(f"[ERROR] {result.path.name}: {result.error}")
+    elif result.out_path is None:
+        print(f"[WARN] No tables parsed in: {result.path.name}")
+    else:
+        print(
+            f"[OK] {result.out_path} "
+            f"({result.rows} rows, {result.seconds:.2f}s)"
+        )
+
+
+def run_batch(
+    task: BatchTask, paths: Sequence[Path], workers: int = 1
+) -> List[BatchResult]:
+    """
+    Run `task` over `paths`, reporting results in input order.
+
+    A failing file is reported and skipped; it never stops the batch.
+    """
+    workers = resolve_workers(workers, len(paths))
+    results: List[BatchResult] = []
+    t0 = time.perf_counter()
+
+    if workers == 1:
+        for path in paths:
+            result = run_task(task, path)
+            report_result(result)
+            results.append(result)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_task, task, path) for path in paths]
+            for path, future in zip(paths, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # a worker died (e.g. out of memory) and took the pool
+                    # down; run_task never got to catch it
+                    result = BatchResult(
+                        path, None, 0, 0.0, f"{type(e).__name__}: {e}"
+                    )
+                report_result(result)
+                results.append(result)
+
+    elapsed = time.perf_counter() - t0
+    failed = sum(1 for r in results if r.error is not None)
+    rows = sum(r.rows for r in results)
+    per_sec = 1 / elapsed if elapsed > 0 else 0.0
+    print(
+        f"[SUMMARY] {len(results)} files ({failed} failed) with {workers} "
+        f"worker(s) in {elapsed:.2f}s: {len(results) * per_sec:.2f} files/s, "
+        f"{rows * per_sec:.0f} rows/s"
+    )
+    return results
@@ -0,0 +1,7 @@
+"""
+Frozen copies of excel_to_json.py and transform_sections.py as they were
+before any optimization, kept verbatim as the reference that speedups
+are measured against. streamlit_app.py keeps only the original
+excel_to_workbook_dict, since the rest of the app needs streamlit. Do not
+edit.
+"""
@@ -0,0 +1,72 @@
+import io
+
+from openpyxl import load_workbook
+
+
+def excel_to_workbook_dict(file_bytes: bytes, file_name: str) -> dict:
+    wb = load_workbook(io.BytesIO(file_bytes), data_only=True)
+    sheets: dict[str, dict] = {}
+
+    for ws in wb.worksheets:
+        rows = list(ws.iter_rows(values_only=True))
+        if not rows:
+            continue
+
+        segments: list[tuple[int, int]] = []
+        in_segment = False
+        start_idx = 0
+
+        for idx, row in enumerate(rows):
+            has_data = any(
+                (cell is not None and str(cell).strip() != "") for cell in row
+            )
+            if has_data and not in_segment:
+                in_segment = True
+                start_idx = idx
+            elif not has_data and in_segment:
+                segments.append((start_idx, idx - 1))
+                in_segment = False
+
+        if in_segment:
+            segments.append((start_idx, len(rows) - 1))
+
+        tables = []
+        for start, end in segments:
+            segment_rows = rows[start : end + 1]
+
+            min_col = None
+            max_col = None
+            for r in segment_rows:
+                for j, cell in enumerate(r):
+                    if cell is not None and str(cell).strip() != "":
+                        if min_col is None or j < min_col:
+                            min_col = j
+                        if max_col is None or j > max_col:
+                            max_col = j
+
+            if min_col is None:
+                continue
+
+            data = []
+            for r in segment_rows:
+                row_vals = []
+                for j in range(min_col, max_col + 1):
+                    if j < len(r):
+                        row_vals.append(r[j])
+                    else:
+                        row_vals.append(None)
+                data.append(row_vals)
+
+            tables.append(
+                {
+                    "start_row": start + 1,
+                    "start_col": min_col + 1,
+                    "row_count": len(data),
+                    "column_count": max_col - min_col + 1,
+                    "data": data,
+                }
+            )
+
+        sheets[ws.title] = {"tables": tables}
+
+    return {"file_name": file_name, "sheets": sheets}
@@ -0,0 +1,97 @@
+"""
+Compare `clean_numbers` with the old exception-driven `clean_number` on
+every cell of the raw workbook JSON in output/ plus a set of edge tokens.
+
+Run from the repository root:
+    python -m benchmarks.bench_clean_number
+"""
+import json
+import math
+import time
+from pathlib import Path
+from typing import Any, List
+
+from transform_sections import clean_number, clean_numbers
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+OUTPUT_DIR = ROOT_DIR / "output"
+REPEAT = 5
+
+EDGE_CASES: List[Any] = [
+    None, "", " ", "-", "--", "NA", "N/A", "n/a", "1,234.50", "12%", "12 %",
+    "-3.5e2", ".5", "5.", "+7", "1_000", "inf", "-Infinity", "nan", "NaN",
+    "١٢", "abc", "12abc", "1,2,3", "%", "0x10", True, 0, 3.25,
+    float("nan"), "  42  ", "Revenue (in INR)",
+]
+
+
+def clean_number_legacy(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    s = str(value).strip()
+    if s == "":
+        return None
+    if s in ("-", "--", "NA", "N/A"):
+        return None
+    s = s.replace(",", "")
+    if s.endswith("%"):
+        s = s[:-1]
+    try:
+        return float(s)
+    except Exception:
+        return value
+
+
+def same(a: Any, b: Any) -> bool:
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a):
+        return math.isnan(b)
+    return type(a) is type(b) and a == b
+
+
+def load_cells() -> List[Any]:
+    cells: List[Any] = []
+    for path in sorted(OUTPUT_DIR.glob("*.json")):
+        if path.name.startswith("structured_"):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            wb = json.load(f)
+        for sheet in wb.get("sheets", {}).values():
+            for t in sheet.get("tables", []):
+                for row in t.get("data", []):
+                    cells.extend(row)
+    return cells
+
+
+def best_of(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    cells = load_cells() + EDGE_CASES
+    text_cells = [c for c in cells if isinstance(c, str)]
+
+    expected = [clean_number_legacy(c) for c in cells]
+    for got in (clean_numbers(cells), [clean_number(c) for c in cells]):
+        for cell, a, b in zip(cells, expected, got):
+            if not same(a, b):
+                print(f"[ERROR] Mismatch for {cell!r}: {a!r} != {b!r}")
+                return
+
+    for label, sample in (("all cells", cells), ("text cells", text_cells)):
+        old = best_of(lambda: [clean_number_legacy(c) for c in sample])
+        new = best_of(lambda: clean_numbers(sample))
+        print(
+            f"[INFO] {label} ({len(sample)}): legacy {old * 1000:.1f} ms, "
+            f"clean_numbers {new * 1000:.1f} ms ({old / new:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
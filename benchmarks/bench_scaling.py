@@ -0,0 +1,157 @@
+"""
+Time and memory-profile the conversion entry points on synthetic reports
+at growing scale, and write the numbers to a JSON file for comparison
+between commits.
+
+Run from the repository root:
+    python -m benchmarks.bench_scaling --scales 1 10 100
+    python -m benchmarks.bench_scaling --compare benchmarks/results/<old>.json
+"""
+import argparse
+import contextlib
+import io
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic_workbook import generate_workbook
+from excel_to_json import workbook_to_json
+from json_writer import dumps, load
+from streamlit_app import excel_to_workbook_dict
+from transform_sections import process_workbook_json
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT_DIR / "benchmarks" / "results"
+BASE_ROWS = 20
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return out.stdout.strip()
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Tuple[float, float]:
+    """
+    (best wall time in seconds, peak traced allocation in MB). The memory
+    run is separate because tracemalloc slows the code it traces.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / (1024 * 1024)
+
+
+def quiet(fn: Callable[[], Any]) -> Callable[[], Any]:
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+
+    return run
+
+
+def bench_scale(
+    work_dir: Path, scale: int, sheets: int, repeat: int
+) -> List[Dict[str, Any]]:
+    rows = BASE_ROWS * scale
+    xlsx = work_dir / f"synthetic_x{scale}.xlsx"
+    shape = generate_workbook(xlsx, rows_per_sheet=rows, sheets=sheets)
+    data = xlsx.read_bytes()
+
+    raw_json = xlsx.with_suffix(".json")
+    wb_json = quiet(lambda: workbook_to_json(xlsx))()
+    raw_json.write_text(dumps(wb_json), encoding="utf-8")
+
+    cases: List[Tuple[str, Callable[[], Any]]] = [
+        ("workbook_to_json", quiet(lambda: workbook_to_json(xlsx))),
+        ("excel_to_workbook_dict", lambda: excel_to_workbook_dict(data, xlsx.name)),
+        ("process_workbook_json", lambda: process_workbook_json(raw_json)),
+    ]
+    results = []
+    for name, fn in cases:
+        seconds, peak_mb = measure(fn, repeat)
+        results.append(
+            {
+                "function": name,
+                "scale": scale,
+                "rows_per_sheet": rows,
+                "sheets": shape["sheets"],
+                "cells": shape["cells"],
+                "xlsx_bytes": len(data),
+                "json_bytes": raw_json.stat().st_size,
+                "seconds": round(seconds, 6),
+                "peak_mb": round(peak_mb, 3),
+            }
+        )
+        print(
+            f"[INFO] x{scale:<4} {name:<24} {seconds * 1000:10.1f} ms "
+            f"{peak_mb:9.1f} MB peak ({shape['cells']} cells)"
+        )
+    return results
+
+
+def compare(current: Dict[str, Any], baseline_path: Path) -> None:
+    baseline = load(baseline_path)
+    old = {(r["function"], r["scale"]): r for r in baseline.get("results", [])}
+    print(f"[INFO] vs {baseline_path.name} (commit {baseline.get('commit')})")
+    for r in current["results"]:
+        prev = old.get((r["function"], r["scale"]))
+        if prev is None:
+            continue
+        speedup = prev["seconds"] / r["seconds"] if r["seconds"] else float("inf")
+        print(
+            f"[INFO] x{r['scale']:<4} {r['function']:<24} {speedup:6.2f}x time, "
+            f"{prev['peak_mb']:.1f} -> {r['peak_mb']:.1f} MB"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--sheets", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", type=Path, help="results file")
+    parser.add_argument("--compare", type=Path, help="earlier results file")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            results.extend(bench_scale(Path(tmp), scale, args.sheets, args.repeat))
+
+    report = {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "base_rows": BASE_ROWS,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    out = args.out or RESULTS_DIR / f"scaling_{commit}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(dumps(report), encoding="utf-8")
+    print(f"[OK] {out}")
+    if args.compare is not None:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Compare the mask-based `split_into_tables` against the old row-by-row walk
+on the sample workbooks in data/.
+
+Run from the repository root:
+    python -m benchmarks.bench_split_into_tables
+"""
+import time
+from pathlib import Path
+from typing import Any, List, Tuple
+
+import pandas as pd
+
+from excel_to_json import is_empty_row, split_into_tables
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT_DIR / "data"
+REPEAT = 5
+
+
+def split_into_tables_rowwise(
+    df_raw: pd.DataFrame
+) -> List[Tuple[int, int, int, int, pd.DataFrame]]:
+    df = df_raw.astype(object)
+    df = df.where(pd.notnull(df), None)
+
+    tables: List[Tuple[int, int, int, int, pd.DataFrame]] = []
+    current_start: Any = None
+
+    for idx, row in df.iterrows():
+        if is_empty_row(row):
+            if current_start is not None:
+                block = df.loc[current_start : idx - 1]
+                block = block.dropna(axis=1, how="all")
+                if not block.empty:
+                    tables.append(
+                        (current_start, block.columns[0], idx - 1,
+                         block.columns[-1], block)
+                    )
+                current_start = None
+        else:
+            if current_start is None:
+                current_start = idx
+
+    if current_start is not None:
+        end_r = df.index[-1]
+        block = df.loc[current_start:end_r]
+        block = block.dropna(axis=1, how="all")
+        if not block.empty:
+            tables.append(
+                (current_start, block.columns[0], end_r, block.columns[-1], block)
+            )
+
+    return tables
+
+
+def same_tables(a, b) -> bool:
+    if len(a) != len(b):
+        return False
+    for (sr1, sc1, er1, ec1, b1), (sr2, sc2, er2, ec2, b2) in zip(a, b):
+        if (sr1, sc1, er1, ec1) != (sr2, sc2, er2, ec2):
+            return False
+        if not b1.equals(b2) or list(b1.columns) != list(b2.columns):
+            return False
+    return True
+
+
+def time_it(fn, frames) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        for df in frames:
+            fn(df)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    excel_files = sorted(DATA_DIR.glob("*.xlsx"))
+    if not excel_files:
+        print("[ERROR] No Excel files found in 'data' folder.")
+        return
+
+    total_old = 0.0
+    total_new = 0.0
+    for path in excel_files:
+        xls = pd.ExcelFile(path, engine="openpyxl")
+        frames = [xls.parse(sheet_name=s, header=None) for s in xls.sheet_names]
+
+        for df in frames:
+            if not same_tables(split_into_tables_rowwise(df), split_into_tables(df)):
+                print(f"[ERROR] Output mismatch in: {path.name}")
+                return
+
+        old = time_it(split_into_tables_rowwise, frames)
+        new = time_it(split_into_tables, frames)
+        total_old += old
+        total_new += new
+        print(
+            f"[INFO] {path.name}: rowwise {old * 1000:.1f} ms, "
+            f"masked {new * 1000:.1f} ms ({old / new:.1f}x)"
+        )
+
+    print(
+        f"[DONE] total rowwise {total_old * 1000:.1f} ms, "
+        f"masked {total_new * 1000:.1f} ms ({total_old / total_new:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
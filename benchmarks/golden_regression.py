@@ -0,0 +1,260 @@
+"""
+Run every code path from data/*.xlsx to structured JSON, deep-diff each
+result against the committed output/structured_*.json and report the
+speedup of each path over its reference.
+
+Run from the repository root:
+    python -m benchmarks.golden_regression
+    python -m benchmarks.golden_regression --paths pandas cli --baseline pandas
+
+Each path is timed against the original code doing the same work, frozen
+in benchmarks/baseline: the full CLI, the parsers alone on the raw JSON,
+or the Streamlit loader. --baseline times every path against one path.
+
+Exits with status 1 when any path differs from the golden files.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from benchmarks.baseline import excel_to_json as baseline_excel
+from benchmarks.baseline import streamlit_app as baseline_streamlit
+from benchmarks.baseline import transform_sections as baseline_transform
+from excel_to_json import split_into_tables, table_to_json_entry, workbook_to_json
+from json_writer import load
+from streamlit_app import excel_to_workbook_dict
+from transform_sections import process_workbook_dict, process_workbook_json
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT_DIR / "data"
+OUTPUT_DIR = ROOT_DIR / "output"
+REPEAT = 3
+MAX_DIFFS = 10
+
+CodePath = Callable[[Path], Optional[Dict[str, Any]]]
+
+
+def baseline_path(xlsx: Path) -> Optional[Dict[str, Any]]:
+    """
+    The original two-step CLI: the frozen excel_to_json writes the raw
+    JSON, and the frozen transform_sections reads it back and parses it.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        wb_json = baseline_excel.workbook_to_json(xlsx)
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = Path(tmp) / xlsx.with_suffix(".json").name
+        with open(raw, "w", encoding="utf-8") as f:
+            json.dump(wb_json, f, indent=2, ensure_ascii=False)
+        return baseline_transform.process_workbook_json(raw)
+
+
+def pandas_path(xlsx: Path) -> Optional[Dict[str, Any]]:
+    """
+    pandas.read_excel per sheet, then the current split_into_tables and
+    parsers.
+    """
+    xls = pd.ExcelFile(xlsx, engine="openpyxl")
+    sheets: Dict[str, Any] = {}
+    for sheet_name in xls.sheet_names:
+        df = xls.parse(sheet_name=sheet_name, header=None)
+        tables = split_into_tables(df)
+        sheets[sheet_name] = {
+            "table_count": len(tables),
+            "tables": [
+                table_to_json_entry(idx, sr, sc, er, ec, block.values.tolist())
+                for idx, (sr, sc, er, ec, block) in enumerate(tables, start=1)
+            ],
+        }
+    return process_workbook_dict({"file_name": xlsx.name, "sheets": sheets})
+
+
+def cli_path(xlsx: Path) -> Optional[Dict[str, Any]]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        wb_json = workbook_to_json(xlsx)
+    return process_workbook_dict(wb_json, xlsx.name)
+
+
+def streamlit_path(xlsx: Path) -> Optional[Dict[str, Any]]:
+    wb = excel_to_workbook_dict(xlsx.read_bytes(), xlsx.name)
+    return process_workbook_dict(wb, xlsx.name)
+
+
+def baseline_streamlit_path(xlsx: Path) -> Optional[Dict[str, Any]]:
+    """
+    The original Streamlit upload: the frozen loader, its raw JSON written
+    out and read back by the frozen parsers.
+    """
+    wb = baseline_streamlit.excel_to_workbook_dict(xlsx.read_bytes(), xlsx.name)
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = Path(tmp) / f"{xlsx.stem}_workbook.json"
+        raw.write_text(json.dumps(wb, ensure_ascii=False), encoding="utf-8")
+        return baseline_transform.process_workbook_json(raw)
+
+
+def baseline_raw_json_path(xlsx: Path) -> Optional[Dict[str, Any]]:
+    """
+    The frozen parsers alone, on the committed raw workbook JSON.
+    """
+    return baseline_transform.process_workbook_json(
+        OUTPUT_DIR / xlsx.with_suffix(".json").name
+    )
+
+
+def raw_json_path(xlsx: Path) -> Optional[Dict[str, Any]]:
+    """
+    Parsers only: the committed raw workbook JSON to structured JSON.
+    """
+    return process_workbook_json(OUTPUT_DIR / xlsx.with_suffix(".json").name)
+
+
+# New fast paths register here to be checked against the golden files.
+CODE_PATHS: Dict[str, CodePath] = {
+    "baseline": baseline_path,
+    "pandas": pandas_path,
+    "cli": cli_path,
+    "streamlit": streamlit_path,
+    "baseline_streamlit": baseline_streamlit_path,
+    "baseline_raw_json": baseline_raw_json_path,
+    "raw_json": raw_json_path,
+}
+# The original code each path is timed against, unless --baseline is given.
+REFERENCES: Dict[str, str] = {
+    "pandas": "baseline",
+    "cli": "baseline",
+    "raw_json": "baseline_raw_json",
+    "streamlit": "baseline_streamlit",
+}
+# The golden files come from the CLI. The Streamlit loader keeps raw cell
+# values (1.0, not 1) and the contiguous column span, so it differs from
+# them by design and is diffed against the original loader's output.
+DIFF_AGAINST_REFERENCE = {"streamlit", "baseline_streamlit"}
+DEFAULT_PATHS = [
+    "baseline",
+    "pandas",
+    "cli",
+    "baseline_raw_json",
+    "raw_json",
+    "baseline_streamlit",
+    "streamlit",
+]
+
+
+def deep_diff(
+    expected: Any, actual: Any, path: str = "$", out: Optional[List[str]] = None
+) -> List[str]:
+    """
+    Differences as "path: message" lines. Dict key order counts, since it
+    decides the order of tables and fields in the written JSON.
+    """
+    if out is None:
+        out = []
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        shared = [k for k in expected if k in actual]
+        for key in expected:
+            if key not in actual:
+                out.append(f"{path}[{key!r}]: missing")
+        for key in actual:
+            if key not in expected:
+                out.append(f"{path}[{key!r}]: unexpected")
+        for key in shared:
+            deep_diff(expected[key], actual[key], f"{path}[{key!r}]", out)
+        if shared != [k for k in actual if k in expected]:
+            out.append(f"{path}: key order differs")
+    elif isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            out.append(f"{path}: length {len(expected)} != {len(actual)}")
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            deep_diff(e, a, f"{path}[{i}]", out)
+    elif isinstance(expected, (dict, list)) or isinstance(actual, (dict, list)):
+        out.append(f"{path}: {type(expected).__name__} != {type(actual).__name__}")
+    elif not same_scalar(expected, actual):
+        out.append(f"{path}: {expected!r} != {actual!r}")
+    return out
+
+
+def same_scalar(a: Any, b: Any) -> bool:
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a):
+        return math.isnan(b)
+    # 1 and 1.0 serialize differently, so the type has to match too
+    return type(a) is type(b) and a == b
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Golden-output regression check.")
+    parser.add_argument(
+        "--paths", nargs="+", choices=sorted(CODE_PATHS), default=DEFAULT_PATHS
+    )
+    parser.add_argument("--baseline", choices=sorted(CODE_PATHS))
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    args = parser.parse_args(argv)
+
+    def reference_of(name: str) -> str:
+        return args.baseline or REFERENCES.get(name, name)
+
+    paths = list(dict.fromkeys([*map(reference_of, args.paths), *args.paths]))
+    totals = {name: 0.0 for name in paths}
+    failed = 0
+
+    for xlsx in sorted(DATA_DIR.glob("*.xlsx")):
+        golden_path = OUTPUT_DIR / f"structured_{xlsx.with_suffix('.json').name}"
+        if not golden_path.exists():
+            print(f"[WARN] No golden output for {xlsx.name}")
+            continue
+        golden = load(golden_path)
+        print(f"[INFO] {xlsx.name}")
+        results: Dict[str, Any] = {}
+        for name in paths:
+            fn = CODE_PATHS[name]
+            result = results[name] = fn(xlsx)
+            expected = golden
+            if name in DIFF_AGAINST_REFERENCE:
+                reference = REFERENCES.get(name, name)
+                if reference not in results:
+                    results[reference] = CODE_PATHS[reference](xlsx)
+                expected = results[reference]
+            diffs = deep_diff(expected, result)
+            seconds = best_of(lambda: fn(xlsx), args.repeat)
+            totals[name] += seconds
+            status = "OK" if not diffs else f"{len(diffs)} DIFF(S)"
+            if expected is result:
+                status = "REFERENCE"
+            print(f"  {name:<17} {seconds * 1000:9.1f} ms  {status}")
+            for line in diffs[:MAX_DIFFS]:
+                print(f"    {line}")
+            if diffs:
+                failed += 1
+
+    print("[SUMMARY] total time, speedup vs reference:")
+    for name in paths:
+        reference = reference_of(name)
+        base = totals[reference]
+        speedup = base / totals[name] if totals[name] else float("inf")
+        print(
+            f"  {name:<17} {totals[name] * 1000:9.1f} ms  {speedup:5.2f}x"
+            f"  vs {reference}"
+        )
+    if failed:
+        print(f"[ERROR] {failed} result(s) differ from the golden output")
+        raise SystemExit(1)
+    print("[OK] All results match the golden output")
+
+
+if __name__ == "__main__":
+    main()
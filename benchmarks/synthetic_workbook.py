@@ -0,0 +1,224 @@
+"""
+Synthetic GST advance reports with the sheet layout of the samples in
+data/: a banner block, then titled tables with FY/TTM or monthly headers.
+
+    python -m benchmarks.synthetic_workbook out.xlsx --rows 200 --sheets 6
+"""
+import argparse
+import random
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from openpyxl import Workbook
+
+FISCAL_YEARS = ["2023-24", "2024-25", "2025-26"]
+MONTH_NAMES = ["Apr", "May", "Jun", "Jul", "Aug", "Sep",
+               "Oct", "Nov", "Dec", "Jan", "Feb", "Mar"]
+TTM_LABEL = "TTM (Nov-24 to Oct-25)"
+STATES = [
+    ("Rajasthan", "08"), ("Goa", "30"), ("Maharashtra", "27"),
+    ("Gujarat", "24"), ("Delhi", "07"), ("Karnataka", "29"),
+    ("Tamil Nadu", "33"), ("Uttar Pradesh", "09"), ("Bihar", "10"),
+    ("Madhya Pradesh", "23"),
+]
+ADJUSTED_CATEGORIES = [
+    "Revenue - Business to Business (B2B)",
+    "Revenue - Business to Consumers Large (B2CL)",
+    "Revenue- Business to Consumer Small (B2CS) ",
+    "Revenue - Exports",
+]
+GSTIN_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+Rows = List[List[Any]]
+SheetBuilder = Callable[[random.Random, int], Rows]
+
+
+def months(fy: str) -> List[str]:
+    start = int(fy[:4]) % 100
+    # Jan-Mar fall in the second calendar year of the FY
+    return [
+        f"{m}-{start if i < 9 else start + 1:02d}" for i, m in enumerate(MONTH_NAMES)
+    ]
+
+
+def period_labels() -> List[str]:
+    """
+    Months of every FY followed by the FY total, then TTM.
+    """
+    labels: List[str] = []
+    for fy in FISCAL_YEARS:
+        labels.extend(months(fy))
+        labels.append(f"FY {fy}")
+    labels.append(TTM_LABEL)
+    return labels
+
+
+def fake_gstin(rng: random.Random, state_code: str) -> str:
+    pan = "".join(rng.choice(GSTIN_CHARS) for _ in range(5))
+    pan += f"{rng.randrange(10000):04d}" + rng.choice(GSTIN_CHARS)
+    return f"{state_code}{pan}1Z{rng.choice(GSTIN_CHARS)}"
+
+
+def amount(rng: random.Random) -> Any:
+    # the reports print "-" for empty months
+    return "-" if rng.random() < 0.3 else round(rng.uniform(0, 5e6), 2)
+
+
+def banner(name: str) -> Rows:
+    return [
+        [name],
+        ["PAN:\t\t\t\t\tABCDE1234F\nGSTN:\t\t\t\t\t08ABCDE1234F1Z7\n"
+         "Period Covered:\t\tApr-23 to Oct-25"],
+        [],
+    ]
+
+
+def summary_sheet(rng: random.Random, rows: int) -> Rows:
+    out: Rows = [["Yearly Summary (in INR)"]]
+    out.append(["PARTICULARS"] + [f"FY {fy}" for fy in FISCAL_YEARS] + [TTM_LABEL])
+    for i in range(rows):
+        out.append([f"Metric {i + 1}"] + [amount(rng) for _ in range(4)])
+    out.append([])
+    for fy in FISCAL_YEARS:
+        out.append([f"FY {fy} Monthly Summary (in INR)"])
+        out.append(["Particulars"] + months(fy))
+        for i in range(max(1, rows // 4)):
+            out.append([f"Metric {i + 1}"] + [amount(rng) for _ in range(12)])
+        out.append([])
+    return out
+
+
+def state_wise_sheet(rng: random.Random, rows: int) -> Rows:
+    labels = period_labels()
+    out: Rows = [["State wise Bifurcation of Revenue (in INR) "]]
+    header: List[Any] = ["PARTICULARS", "STATE CODE"]
+    sub: List[Any] = [None, None]
+    for label in labels:
+        header += [label, None]
+        sub += ["AMOUNT", "% SHARE IN  ADJUSTED REVENUE"]
+    out += [header, sub]
+    for i in range(rows):
+        state, code = STATES[i % len(STATES)]
+        row: List[Any] = [f"Inter State ({state}) {i + 1}", code]
+        for _ in labels:
+            row += [amount(rng), round(rng.random(), 6)]
+        out.append(row)
+    return out
+
+
+def party_sheet(rng: random.Random, rows: int, role: str) -> Rows:
+    labels = period_labels()
+    if role == "customer":
+        title = "Partywise Bifurcation of Revenue (in INR) "
+    else:
+        title = "Partywise Bifurcation of Purchase and Expenses (in INR)"
+    upper = role.upper()
+    out: Rows = [[title], [f"{upper}'S NAME", f"{upper}'S GSTIN"] + labels]
+    for i in range(rows):
+        code = STATES[i % len(STATES)][1]
+        out.append(
+            # the party parsers skip labels containing the role word
+            [f"PARTY {i + 1} ENTERPRISES", fake_gstin(rng, code)]
+            + [amount(rng) for _ in labels]
+        )
+    return out
+
+
+def product_sheet(rng: random.Random, rows: int) -> Rows:
+    labels = period_labels()
+    out: Rows = [
+        ["Product Wise Bifurcation of Revenue (in INR)"],
+        ["PRODUCT (HSN)", "HSN's Name"] + labels,
+    ]
+    for i in range(rows):
+        hsn = str(10000000 + rng.randrange(89999999))
+        values = [amount(rng) for _ in labels]
+        out.append([hsn, f"Product {i + 1} - {hsn}"] + values)
+    return out
+
+
+def gstr3b_sheet(rng: random.Random, rows: int) -> Rows:
+    all_months = [m for fy in FISCAL_YEARS for m in months(fy)]
+    out: Rows = []
+    for t in range(max(1, rows // 5)):
+        out.append([f"Summary of Revenue {t + 1} (in INR)"])
+        out.append(["PARTICULARS"] + all_months)
+        for i in range(5):
+            values = [amount(rng) for _ in all_months]
+            out.append([f"Particular {t + 1}.{i + 1}"] + values)
+        out.append([])
+    return out
+
+
+def adjusted_amounts_sheet(rng: random.Random, rows: int) -> Rows:
+    labels = period_labels()
+    header: List[Any] = ["PARTICULARS"]
+    sub: List[Any] = [None]
+    for label in labels:
+        header += [label, None]
+        sub += ["AMOUNT", "% SHARE IN  ADJUSTED REVENUE"]
+    out: Rows = [["Bifurcation of Revenue (in INR)"], header, sub, []]
+    for i in range(max(1, rows // 3)):
+        category = ADJUSTED_CATEGORIES[i % len(ADJUSTED_CATEGORIES)]
+        for label in (category, "Add: Debit Notes", "Less: Credit Notes"):
+            row: List[Any] = [label]
+            for _ in labels:
+                row += [amount(rng), " "]
+            out.append(row)
+        out.append([])
+    return out
+
+
+SHEET_BUILDERS: List[Tuple[str, SheetBuilder]] = [
+    ("Summary", summary_sheet),
+    ("State Wise", state_wise_sheet),
+    ("Customer Wise", lambda rng, rows: party_sheet(rng, rows, "customer")),
+    ("Product Wise", product_sheet),
+    ("GSTR 3B", gstr3b_sheet),
+    ("Adjusted Amounts", adjusted_amounts_sheet),
+    ("Supplier Wise", lambda rng, rows: party_sheet(rng, rows, "supplier")),
+]
+
+
+def generate_workbook(
+    path: Path,
+    rows_per_sheet: int = 20,
+    sheets: int = 6,
+    seed: int = 0,
+    company: str = "SYNTHETIC TRADERS",
+) -> Dict[str, int]:
+    """
+    Write a synthetic report to `path` and return its sheet, row and cell
+    counts. Sheets beyond the built-in layouts repeat them with a numeric
+    suffix, which routes them to the default parser chain.
+    """
+    rng = random.Random(seed)
+    wb = Workbook(write_only=True)
+    n_rows = n_cells = 0
+    for i in range(sheets):
+        name, build = SHEET_BUILDERS[i % len(SHEET_BUILDERS)]
+        if i >= len(SHEET_BUILDERS):
+            name = f"{name} {i // len(SHEET_BUILDERS) + 1}"
+        ws = wb.create_sheet(name)
+        for row in banner(company) + build(rng, rows_per_sheet):
+            ws.append(row)
+            n_rows += 1
+            n_cells += sum(1 for v in row if v is not None)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    wb.save(path)
+    return {"sheets": sheets, "rows": n_rows, "cells": n_cells}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Write a synthetic GST report.")
+    parser.add_argument("out", type=Path)
+    parser.add_argument("--rows", type=int, default=20, help="data rows per sheet")
+    parser.add_argument("--sheets", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    stats = generate_workbook(args.out, args.rows, args.sheets, args.seed)
+    print(f"[OK] {args.out}: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+# What the parsers read a table as: rows of cells, indexed by position.
+# Both CellTable and the list-of-lists from raw workbook JSON qualify.
+Matrix = Sequence[Sequence[Any]]
+
+# Layouts of the raw workbook JSON, named by its "format_version" field;
+# files without the field are version 1.
+DENSE_FORMAT = 1  # "data": every row padded with null to the table width
+TRIMMED_FORMAT = 2  # "rows": rows without their trailing nulls
+RAW_FORMATS = (DENSE_FORMAT, TRIMMED_FORMAT)
+
+
+def trim_row(row: Sequence[Any]) -> List[Any]:
+    """
+    The row without its trailing None cells.
+    """
+    end = len(row)
+    while end and row[end - 1] is None:
+        end -= 1
+    return list(row[:end])
+
+
+class CellTable:
+    """
+    Immutable table of equal-width rows stored as tuples: no per-row list
+    over-allocation, and `table[i]` hands out the row itself.
+
+    Rows keep their trailing None cells; header parsing spreads a label
+    over the empty cells after it, up to the table's last column.
+    """
+
+    __slots__ = ("rows", "width")
+
+    def __init__(self, rows: Iterable[Sequence[Any]], width: int):
+        pad = (None,) * width
+        self.rows: Tuple[Tuple[Any, ...], ...] = tuple(
+            tuple(r) if len(r) == width else (*r, *pad)[:width] for r in rows
+        )
+        self.width = width
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        return iter(self.rows)
+
+    def __getitem__(self, i: Any) -> Any:
+        # an int gives a row tuple, a slice a tuple of rows
+        return self.rows[i]
+
+    def __repr__(self) -> str:
+        return f"CellTable({len(self.rows)} rows x {self.width} cols)"
+
+    def to_lists(self) -> List[List[Any]]:
+        """
+        The rows as lists, the form the raw workbook JSON stores.
+        """
+        return [list(row) for row in self.rows]
@@ -1,14 +1,25 @@
-import json
+import argparse
+from functools import partial
 from pathlib import Path
-from typing import List, Tuple, Dict, Any
+from typing import Iterator, List, Tuple, Dict, Any, Optional
 
+import numpy as np
 import pandas as pd
 import math
 
+from batch import add_batch_args, run_batch
+from cell_table import DENSE_FORMAT, RAW_FORMATS, trim_row
+from json_writer import open_for_replace, write_json_stream
+from manifest import output_version, run_incremental_batch
+from profiling import add_profile_args, profile_from_args, timer
+from transform_sections import PARSER_VERSION
+from workbook_reader import iter_sheet_tables, open_workbook
+
 BASE_DIR = Path(r"D:\Aadiswan Task")
 DATA_DIR = BASE_DIR / "data"
 OUTPUT_DIR = BASE_DIR / "output"
 FILE_PATTERN = "*.xlsx"
+MANIFEST_NAME = ".excel_to_json.manifest"
 
 
 def is_empty_value(v: Any) -> bool:
@@ -28,44 +39,60 @@ def is_empty_row(row: pd.Series) -> bool:
     return True
 
 
+def blank_cell_mask(values: np.ndarray, null_mask: np.ndarray) -> np.ndarray:
+    """
+    Boolean matrix marking the cells `is_empty_value` treats as empty.
+    """
+    flat = pd.Series(values.ravel(), dtype=object)
+    try:
+        blank_str = flat.str.strip().eq("").to_numpy(dtype=bool)
+    except AttributeError:
+        # no string cells at all in the sheet
+        return null_mask
+    return null_mask | blank_str.reshape(null_mask.shape)
+
+
+def row_runs(non_empty: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    (first, last) positions of each run of True values.
+    """
+    padded = np.concatenate(([0], non_empty.astype(np.int8), [0]))
+    edges = np.diff(padded)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
 def split_into_tables(
     df_raw: pd.DataFrame
 ) -> List[Tuple[int, int, int, int, pd.DataFrame]]:
     """
     Split a sheet into blocks separated by fully empty rows.
     """
-    df = df_raw.astype(object)
-    df = df.where(pd.notnull(df), None)
+    values = df_raw.to_numpy(dtype=object, copy=True)
+    null_mask = pd.isna(values)
+    values[null_mask] = None
+    df = pd.DataFrame(
+        values, index=df_raw.index, columns=df_raw.columns, dtype=object
+    )
 
     tables: List[Tuple[int, int, int, int, pd.DataFrame]] = []
-    current_start: int | None = None
-
-    for idx, row in df.iterrows():
-        if is_empty_row(row):
-            if current_start is not None:
-                start_r = current_start
-                end_r = idx - 1
-                block = df.loc[start_r:end_r]
-                block = block.dropna(axis=1, how="all")
-                if not block.empty:
-                    start_c = block.columns[0]
-                    end_c = block.columns[-1]
-                    tables.append((start_r, start_c, end_r, end_c, block))
-                current_start = None
-        else:
-            if current_start is None:
-                current_start = idx
-
-    # last block
-    if current_start is not None:
-        start_r = current_start
-        end_r = df.index[-1]
-        block = df.loc[start_r:end_r]
-        block = block.dropna(axis=1, how="all")
-        if not block.empty:
-            start_c = block.columns[0]
-            end_c = block.columns[-1]
-            tables.append((start_r, start_c, end_r, end_c, block))
+    if df.empty:
+        return tables
+
+    blank = blank_cell_mask(values, null_mask)
+    not_null = ~null_mask
+
+    for first, last in row_runs(~blank.all(axis=1)):
+        col_pos = np.flatnonzero(not_null[first : last + 1].any(axis=0))
+        if col_pos.size == 0:
+            continue
+        block = df.iloc[first : last + 1, col_pos]
+        start_r = df.index[first]
+        end_r = df.index[last]
+        start_c = block.columns[0]
+        end_c = block.columns[-1]
+        tables.append((start_r, start_c, end_r, end_c, block))
 
     return tables
 
@@ -76,72 +103,161 @@ def table_to_json_entry(
     start_col: int,
     end_row: int,
     end_col: int,
-    block: pd.DataFrame,
+    matrix: List[List[Any]],
+    raw_format: int = DENSE_FORMAT,
 ) -> Dict[str, Any]:
-    matrix = block.values.tolist()
-
     for i in range(len(matrix)):
         for j in range(len(matrix[i])):
             v = matrix[i][j]
             if isinstance(v, float) and math.isnan(v):
                 matrix[i][j] = None
 
-    return {
+    entry: Dict[str, Any] = {
         "table_index": table_idx,
         "start_row": int(start_row) + 1,
         "start_col": int(start_col) + 1,
         "end_row": int(end_row) + 1,
         "end_col": int(end_col) + 1,
-        "row_count": int(block.shape[0]),
-        "column_count": int(block.shape[1]),
-        "data": matrix,
+        "row_count": len(matrix),
+        "column_count": len(matrix[0]) if matrix else 0,
     }
+    if raw_format == DENSE_FORMAT:
+        entry["data"] = matrix
+    else:
+        # column_count lets readers pad the rows back out
+        entry["rows"] = [trim_row(row) for row in matrix]
+    return entry
 
 
-def workbook_to_json(path: Path) -> Dict[str, Any]:
-    print(f"[INFO] Processing: {path.name}")
-    xls = pd.ExcelFile(path, engine="openpyxl")
-    sheets_json: Dict[str, Any] = {}
+def workbook_head(file_name: str, raw_format: int = DENSE_FORMAT) -> Dict[str, Any]:
+    head: Dict[str, Any] = {"file_name": file_name}
+    if raw_format != DENSE_FORMAT:
+        head["format_version"] = raw_format
+    return head
 
-    for sheet_name in xls.sheet_names:
-        df = xls.parse(sheet_name=sheet_name, header=None)
-        tables = split_into_tables(df)
 
-        sheet_entry = {
-            "table_count": len(tables),
-            "tables": []
-        }
+def iter_workbook_sheets(
+    path: Path, raw_format: int = DENSE_FORMAT
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    wb = open_workbook(path)
+    try:
+        for ws in wb.worksheets:
+            with timer("segment", ws.title):
+                tables = list(
+                    iter_sheet_tables(ws, pandas_values=True, drop_empty_columns=True)
+                )
 
-        for idx, (sr, sc, er, ec, block) in enumerate(tables, start=1):
-            sheet_entry["tables"].append(
-                table_to_json_entry(idx, sr, sc, er, ec, block)
-            )
+            sheet_entry: Dict[str, Any] = {
+                "table_count": 0,
+                "tables": []
+            }
 
-        sheets_json[sheet_name] = sheet_entry
+            for idx, (sr, sc, er, ec, rows) in enumerate(tables, start=1):
+                sheet_entry["tables"].append(
+                    table_to_json_entry(
+                        idx, sr, sc, er, ec, rows.to_lists(), raw_format
+                    )
+                )
+            sheet_entry["table_count"] = len(sheet_entry["tables"])
 
+            yield ws.title, sheet_entry
+    finally:
+        wb.close()
+
+
+def workbook_to_json(path: Path, raw_format: int = DENSE_FORMAT) -> Dict[str, Any]:
+    print(f"[INFO] Processing: {path.name}")
     return {
-        "file_name": path.name,
-        "sheets": sheets_json,
+        **workbook_head(path.name, raw_format),
+        "sheets": dict(iter_workbook_sheets(path, raw_format)),
     }
 
 
-def save_workbook_json(wb_json: Dict[str, Any], excel_file: Path):
+def save_workbook_json(
+    wb_json: Dict[str, Any], excel_file: Path, indent: Optional[int] = 2
+) -> Path:
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     out_file = OUTPUT_DIR / excel_file.with_suffix(".json").name
-    with open(out_file, "w", encoding="utf-8") as f:
-        json.dump(wb_json, f, indent=2, ensure_ascii=False)
+    with open_for_replace(out_file) as f:
+        write_json_stream(
+            f,
+            {k: v for k, v in wb_json.items() if k != "sheets"},
+            "sheets",
+            wb_json.get("sheets", {}).items(),
+            indent,
+        )
     print(f"[OK] JSON created: {out_file}")
+    return out_file
+
 
+def convert_workbook(
+    excel_file: Path, indent: Optional[int] = 2, raw_format: int = DENSE_FORMAT
+) -> Tuple[int, Optional[Path]]:
+    """
+    Stream one workbook to its raw JSON file, a sheet at a time.
+    """
+    print(f"[INFO] Processing: {excel_file.name}")
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    out_file = OUTPUT_DIR / excel_file.with_suffix(".json").name
+    rows = 0
+
+    def counted_sheets() -> Iterator[Tuple[str, Dict[str, Any]]]:
+        nonlocal rows
+        for name, sheet_entry in iter_workbook_sheets(excel_file, raw_format):
+            rows += sum(t["row_count"] for t in sheet_entry["tables"])
+            yield name, sheet_entry
+
+    with open_for_replace(out_file) as f:
+        write_json_stream(
+            f,
+            workbook_head(excel_file.name, raw_format),
+            "sheets",
+            counted_sheets(),
+            indent,
+        )
+    print(f"[OK] JSON created: {out_file}")
+    return rows, out_file
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Convert GST workbooks to JSON.")
+    add_batch_args(parser)
+    parser.add_argument(
+        "--raw-format",
+        type=int,
+        choices=RAW_FORMATS,
+        default=DENSE_FORMAT,
+        help="1: rows padded with null to the table width; 2: rows without "
+        "trailing nulls (smallest together with --compact)",
+    )
+    add_profile_args(parser)
+    args = parser.parse_args(argv)
 
-def main():
     excel_files = sorted(DATA_DIR.glob(FILE_PATTERN))
     if not excel_files:
         print("[ERROR] No Excel files found in 'data' folder.")
         return
 
-    for excel in excel_files:
-        wb_json = workbook_to_json(excel)
-        save_workbook_json(wb_json, excel)
+    task = partial(
+        convert_workbook,
+        indent=None if args.compact else 2,
+        raw_format=args.raw_format,
+    )
+    with profile_from_args(args):
+        if args.incremental:
+            run_incremental_batch(
+                task,
+                excel_files,
+                args.workers,
+                OUTPUT_DIR / MANIFEST_NAME,
+                output_version(
+                    PARSER_VERSION,
+                    "compact" if args.compact else "",
+                    "" if args.raw_format == DENSE_FORMAT else f"raw{args.raw_format}",
+                ),
+            )
+        else:
+            run_batch(task, excel_files, args.workers)
 
     print("[DONE] All Excel files converted.")
 
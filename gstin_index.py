@@ -0,0 +1,182 @@
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from json_writer import dumps, loads
+from periods import is_period_key
+
+GSTIN_INDEX_NAME = "gstin_index.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS counterparties (
+    gstin TEXT NOT NULL,
+    report TEXT NOT NULL,
+    role TEXT NOT NULL,
+    name TEXT,
+    amounts TEXT NOT NULL,
+    PRIMARY KEY (gstin, report, role)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_counterparties_report ON counterparties(report);
+"""
+
+# (gstin, role) -> (name, {period: amount})
+Counterparties = Dict[Tuple[str, str], Tuple[Optional[str], Dict[str, Any]]]
+
+
+class CounterpartyRef(NamedTuple):
+    report: str
+    role: str
+    name: Optional[str]
+    amounts: Dict[str, Any]
+
+
+def report_id(path: Path) -> str:
+    """
+    Index key of a report: the workbook's file stem, shared by the .xlsx
+    and the raw .json converted from it.
+    """
+    return Path(path).stem
+
+
+def gstin_role(key: str) -> Optional[str]:
+    """
+    Role for a GSTIN column: "customer_gstin" from the party-wise parser,
+    "Customer GSTN" from the details parser.
+    """
+    k = key.strip().lower()
+    if k.endswith("_gstin"):
+        return k[: -len("_gstin")]
+    if k.endswith(" gstn"):
+        return k[: -len(" gstn")].strip()
+    return None
+
+
+def collect_row(row: Dict[str, Any], entries: Counterparties) -> None:
+    gstin = role = None
+    for key, value in row.items():
+        role = gstin_role(key)
+        if role is not None:
+            gstin = value
+            break
+    if role is None or not isinstance(gstin, str) or not gstin.strip():
+        return
+    name = next(
+        (v for k, v in row.items() if k.strip().lower().endswith("name") and v),
+        None,
+    )
+    amounts = {k: v for k, v in row.items() if is_period_key(k)}
+
+    ref = (gstin.strip().upper(), role)
+    old_name, old_amounts = entries.get(ref, (None, {}))
+    # the party-wise table has the amounts, the details table only names
+    entries[ref] = (old_name or name, old_amounts or amounts)
+
+
+def tap_counterparties(
+    tables: Iterable[Tuple[str, Dict[str, Any]]], entries: Counterparties
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Pass structured tables through unchanged, collecting every GSTIN row
+    into `entries` on the way.
+    """
+    for key, table in tables:
+        for row in table.get("metrics") or []:
+            if isinstance(row, dict):
+                collect_row(row, entries)
+        yield key, table
+
+
+def collect_counterparties(
+    tables: Iterable[Tuple[str, Dict[str, Any]]]
+) -> Counterparties:
+    entries: Counterparties = {}
+    for _ in tap_counterparties(tables, entries):
+        pass
+    return entries
+
+
+class GstinIndex:
+    """
+    Persistent GSTIN -> (report, role, name, FY amounts) index, updated
+    one report at a time so no other report is ever re-read.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # batch workers update the index concurrently; wait for the lock
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "GstinIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def update_report(self, report: str, entries: Counterparties) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM counterparties WHERE report = ?", (report,))
+            self.conn.executemany(
+                "INSERT INTO counterparties VALUES (?, ?, ?, ?, ?)",
+                (
+                    (gstin, report, role, name, dumps(amounts, indent=None))
+                    for (gstin, role), (name, amounts) in entries.items()
+                ),
+            )
+
+    def remove_report(self, report: str) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM counterparties WHERE report = ?", (report,))
+
+    def lookup(self, gstin: str) -> List[CounterpartyRef]:
+        rows = self.conn.execute(
+            "SELECT report, role, name, amounts FROM counterparties "
+            "WHERE gstin = ? ORDER BY report, role",
+            (gstin.strip().upper(),),
+        )
+        return [CounterpartyRef(r, role, n, loads(a)) for r, role, n, a in rows]
+
+    def shared_counterparties(
+        self, report_a: str, report_b: str
+    ) -> List[Tuple[str, CounterpartyRef, CounterpartyRef]]:
+        """
+        (gstin, ref in report_a, ref in report_b) for every GSTIN present
+        in both reports, one entry per role pairing.
+        """
+        rows = self.conn.execute(
+            "SELECT a.gstin, a.role, a.name, a.amounts, b.role, b.name, b.amounts "
+            "FROM counterparties a JOIN counterparties b ON b.gstin = a.gstin "
+            "WHERE a.report = ? AND b.report = ? ORDER BY a.gstin, a.role, b.role",
+            (report_a, report_b),
+        )
+        return [
+            (
+                gstin,
+                CounterpartyRef(report_a, role_a, name_a, loads(amounts_a)),
+                CounterpartyRef(report_b, role_b, name_b, loads(amounts_b)),
+            )
+            for gstin, role_a, name_a, amounts_a, role_b, name_b, amounts_b in rows
+        ]
+
+    def reports(self) -> List[str]:
+        return [
+            r[0]
+            for r in self.conn.execute(
+                "SELECT DISTINCT report FROM counterparties ORDER BY report"
+            )
+        ]
+
+
+def prune_reports(index_path: Path, sources: Iterable[Path]) -> None:
+    """
+    Drop the reports of removed input files from the index.
+    """
+    with GstinIndex(index_path) as index:
+        for src in sources:
+            index.remove_report(report_id(src))
+            print(f"[PRUNE] {report_id(src)} from {index_path.name}")
@@ -0,0 +1,123 @@
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from profiling import timer
+
+# Optional fast backends. Both format floats differently from `repr`
+# (0.00001 vs 1e-05), so neither encodes values directly: msgspec only
+# re-indents the stdlib compact text, which keeps every token as-is.
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if msgspec is not None:
+    _fast_loads = msgspec.json.decode
+    BACKEND = "msgspec"
+elif orjson is not None:
+    # orjson reads integers beyond 64 bits as floats; cell values never
+    # get that large
+    _fast_loads = orjson.loads
+    BACKEND = "orjson"
+else:
+    _fast_loads = None
+    BACKEND = "json"
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if _fast_loads is not None:
+        try:
+            return _fast_loads(data)
+        except ValueError:
+            # NaN/Infinity literals written by json.dump are not strict JSON
+            pass
+    return json.loads(data)
+
+
+def load(path: Path) -> Any:
+    with timer("load", name="json"), open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dumps(value: Any, indent: Optional[int] = 2) -> str:
+    """
+    Same text as json.dumps(value, ensure_ascii=False, indent=indent), or
+    without any whitespace when indent is None.
+    """
+    compact = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    if indent is None:
+        return compact
+    if msgspec is not None and isinstance(indent, int) and indent > 0:
+        try:
+            return msgspec.json.format(compact, indent=indent)
+        except ValueError:
+            # NaN/Infinity: only the stdlib encoder accepts them
+            pass
+    return json.dumps(value, ensure_ascii=False, indent=indent)
+
+
+def write_json_stream(
+    fp: IO[str],
+    head: Dict[str, Any],
+    field: str,
+    items: Iterable[Tuple[str, Any]],
+    indent: Optional[int] = 2,
+) -> int:
+    """
+    Write {**head, field: dict(items)} to `fp`, one item at a time.
+
+    With an indent the text is identical to json.dump(..., indent=indent,
+    ensure_ascii=False); with indent=None it is written without any
+    whitespace. Only the item being encoded is held in memory. Returns the
+    number of items written.
+    """
+    if indent is None:
+        nl, pad1, pad2, colon = "", "", "", ":"
+    else:
+        nl, pad1, pad2, colon = "\n", " " * indent, " " * (2 * indent), ": "
+
+    fp.write("{")
+    for key, value in head.items():
+        text = dumps(value, indent).replace("\n", "\n" + pad1)
+        fp.write(f"{nl}{pad1}{dumps(key)}{colon}{text},")
+    fp.write(f"{nl}{pad1}{dumps(field)}{colon}{{")
+
+    count = 0
+    for key, value in items:
+        if count:
+            fp.write(",")
+        with timer("serialize"):
+            text = dumps(value, indent).replace("\n", "\n" + pad2)
+            fp.write(f"{nl}{pad2}{dumps(key)}{colon}{text}")
+        count += 1
+
+    if count:
+        fp.write(f"{nl}{pad1}}}")
+    else:
+        fp.write("}")
+    fp.write(f"{nl}}}")
+    return count
+
+
+@contextmanager
+def open_for_replace(path: Path) -> Iterator[IO[str]]:
+    """
+    Text file handle whose content replaces `path` only once the block
+    completes, so a failure mid-stream never leaves a truncated file.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
@@ -0,0 +1,130 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from batch import BatchResult, BatchTask, run_batch
+from json_writer import dumps, load
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def output_version(parser_version: str, *options: str) -> str:
+    """
+    Version stamp of the outputs: the parser version plus every non-empty
+    output option, so that switching an option rewrites every output.
+    """
+    return "/".join([parser_version, *(o for o in options if o)])
+
+
+class Manifest:
+    """
+    Per-input record of (mtime, size, sha256, parser version, output) used
+    to skip inputs that have not changed since their last conversion.
+    """
+
+    def __init__(self, path: Path, parser_version: str):
+        self.path = Path(path)
+        self.parser_version = parser_version
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._hashes: Dict[str, str] = {}
+        if self.path.exists():
+            self.files = load(self.path).get("files", {})
+
+    def _hash(self, src: Path) -> str:
+        key = str(src)
+        if key not in self._hashes:
+            self._hashes[key] = file_sha256(src)
+        return self._hashes[key]
+
+    def is_stale(self, src: Path) -> bool:
+        entry = self.files.get(str(src))
+        if entry is None or entry.get("parser_version") != self.parser_version:
+            return True
+        output = entry.get("output")
+        if output is not None and not Path(output).exists():
+            return True
+        st = src.stat()
+        if st.st_size != entry.get("size"):
+            return True
+        if st.st_mtime_ns == entry.get("mtime_ns"):
+            return False
+        # touched but maybe not modified: fall back to the content hash
+        if self._hash(src) != entry.get("sha256"):
+            return True
+        entry["mtime_ns"] = st.st_mtime_ns
+        return False
+
+    def record(self, src: Path, output: Optional[Path]) -> None:
+        st = src.stat()
+        self.files[str(src)] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": self._hash(src),
+            "parser_version": self.parser_version,
+            "output": None if output is None else str(output),
+        }
+
+    def prune(self) -> List[Tuple[Path, Optional[Path]]]:
+        """
+        Drop entries whose source is gone and delete their outputs.
+        Returns (source, deleted output or None) per dropped entry.
+        """
+        removed: List[Tuple[Path, Optional[Path]]] = []
+        for src in list(self.files):
+            if Path(src).exists():
+                continue
+            output = self.files.pop(src).get("output")
+            out_path = None if output is None else Path(output)
+            if out_path is not None and out_path.exists():
+                out_path.unlink()
+            else:
+                out_path = None
+            removed.append((Path(src), out_path))
+        return removed
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(dumps({"files": self.files}))
+        os.replace(tmp_name, self.path)
+
+
+def run_incremental_batch(
+    task: BatchTask,
+    paths: Sequence[Path],
+    workers: int,
+    manifest_path: Path,
+    parser_version: str,
+    on_prune: Optional[Callable[[List[Path]], None]] = None,
+) -> List[BatchResult]:
+    """
+    `run_batch` over the new or changed inputs only, pruning the outputs
+    of inputs that no longer exist. `on_prune` gets the removed inputs,
+    to drop whatever else was derived from them.
+    """
+    manifest = Manifest(manifest_path, parser_version)
+    pruned = manifest.prune()
+    for _, out_path in pruned:
+        if out_path is not None:
+            print(f"[PRUNE] {out_path}")
+    if pruned and on_prune is not None:
+        on_prune([src for src, _ in pruned])
+
+    todo = [p for p in paths if manifest.is_stale(p)]
+    print(f"[INFO] {len(todo)} new or changed, {len(paths) - len(todo)} unchanged")
+
+    results = run_batch(task, todo, workers) if todo else []
+    for result in results:
+        if result.error is None:
+            manifest.record(result.path, result.out_path)
+    manifest.save()
+    return results
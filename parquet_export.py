@@ -0,0 +1,231 @@
+import argparse
+import shutil
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from batch import run_batch
+from periods import is_period_key
+from transform_sections import (
+    OUTPUT_DIR,
+    PRODUCT_WISE_SPEC,
+    STATE_WISE_SPEC,
+    party_spec,
+    process_workbook_json,
+)
+
+PARQUET_DIR = OUTPUT_DIR / "parquet"
+
+# Columns of every family, in order; `source_file` is the partition key
+# and lives in the directory name rather than in the files.
+TABLE_COLUMNS = ["table_key", "sheet", "section_title", "row"]
+VALUE_COLUMNS = ["period", "position", "value", "text"]
+
+FAMILY_COLUMNS: Dict[str, List[str]] = {
+    "fy_metrics": TABLE_COLUMNS + ["metric", "state_code"] + VALUE_COLUMNS,
+    "monthly_particulars": TABLE_COLUMNS + ["metric", "period", "value", "text"],
+    "party_gstin": TABLE_COLUMNS + ["role", "gstin", "party_name"] + VALUE_COLUMNS,
+    "product_hsn": TABLE_COLUMNS + ["hsn", "hsn_name"] + VALUE_COLUMNS,
+    "profile_filing": TABLE_COLUMNS + ["field", "value"],
+}
+
+INT_COLUMNS = {"row", "position"}
+FLOAT_COLUMNS = {"value"}
+
+FamilyColumns = Dict[str, List[Any]]
+
+
+def split_value(value: Any) -> Tuple[Optional[float], Optional[str]]:
+    """
+    (number, text) for one cell value; exactly one is set unless empty.
+    """
+    if value is None:
+        return None, None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value), None
+    return None, str(value)
+
+
+def iter_period_values(row: Dict[str, Any]) -> Iterator[Tuple[str, int, Any]]:
+    """
+    (period, position, value) for the FY/TTM columns of a row. Merged
+    headers give list values; each element gets its own position.
+    """
+    for key, value in row.items():
+        if not is_period_key(key):
+            continue
+        if isinstance(value, list):
+            for pos, item in enumerate(value):
+                yield key, pos, item
+        else:
+            yield key, 0, value
+
+
+def classify_table(table: Dict[str, Any]) -> Optional[str]:
+    rows = [r for r in table.get("metrics") or [] if isinstance(r, dict)]
+    if not rows:
+        return None
+    keys = set().union(*rows)
+    if any(k.endswith("_gstin") for k in keys):
+        return "party_gstin"
+    if PRODUCT_WISE_SPEC.id_field in keys:
+        return "product_hsn"
+    if "monthly_values" in keys:
+        return "monthly_particulars"
+    if table.get("sheet", "").strip().lower().startswith("profile & filing"):
+        return "profile_filing"
+    if any(is_period_key(k) for k in keys):
+        return "fy_metrics"
+    return None
+
+
+def flatten_table(
+    family: str, table_key: str, table: Dict[str, Any], out: FamilyColumns
+) -> None:
+    head = (table_key, table.get("sheet"), table.get("section_title"))
+    if family == "party_gstin":
+        keys = set().union(*(r for r in table["metrics"] if isinstance(r, dict)))
+        gstin_key = next(k for k in keys if k.endswith("_gstin"))
+        role = gstin_key[: -len("_gstin")]
+        name_key = party_spec(role).key_field
+
+    def emit(*values: Any) -> None:
+        for name, v in zip(FAMILY_COLUMNS[family], head + values):
+            out[name].append(v)
+
+    for i, row in enumerate(table["metrics"]):
+        if not isinstance(row, dict):
+            continue
+        if family == "monthly_particulars":
+            for period, v in (row.get("monthly_values") or {}).items():
+                emit(i, row.get("metric"), period, *split_value(v))
+            continue
+        if family == "profile_filing":
+            if set(row) == {"metric", "value"}:
+                items = [(row["metric"], row["value"])]
+            else:
+                items = list(row.items())
+            for field, v in items:
+                text = None if v is None else str(v)
+                emit(i, None if field is None else str(field), text)
+            continue
+
+        if family == "fy_metrics":
+            ids: Tuple[Any, ...] = (
+                row.get("metric"),
+                row.get(STATE_WISE_SPEC.id_field),
+            )
+        elif family == "party_gstin":
+            ids = (role, row.get(gstin_key), row.get(name_key))
+        else:
+            ids = (
+                row.get(PRODUCT_WISE_SPEC.key_field),
+                row.get(PRODUCT_WISE_SPEC.id_field),
+            )
+        for period, pos, v in iter_period_values(row):
+            emit(i, *ids, period, pos, *split_value(v))
+
+
+def flatten_structured(structured: Dict[str, Any]) -> Dict[str, FamilyColumns]:
+    """
+    Tidy column lists per table family for one `process_workbook_json`
+    result. Tables that fit no family (banners, index, text) are left out.
+    """
+    columns = {
+        family: {name: [] for name in names}
+        for family, names in FAMILY_COLUMNS.items()
+    }
+    for table_key, table in structured.get("tables", {}).items():
+        family = classify_table(table)
+        if family is not None:
+            flatten_table(family, table_key, table, columns[family])
+    return columns
+
+
+def family_schema(family: str):
+    import pyarrow as pa
+
+    def field_type(name: str):
+        if name in INT_COLUMNS:
+            return pa.int32()
+        if name in FLOAT_COLUMNS and family != "profile_filing":
+            return pa.float64()
+        return pa.string()
+
+    return pa.schema([(n, field_type(n)) for n in FAMILY_COLUMNS[family]])
+
+
+def partition_dir(out_dir: Path, family: str, source_file: str) -> Path:
+    return out_dir / family / f"source_file={quote(source_file, safe='')}"
+
+
+def write_parquet_datasets(
+    structured: Dict[str, Any], source_file: str, out_dir: Path = PARQUET_DIR
+) -> int:
+    """
+    Replace the `source_file` partition of each family dataset under
+    `out_dir` (hive layout, readable with pyarrow.dataset or DuckDB).
+    Returns the number of rows written.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = 0
+    for family, columns in flatten_structured(structured).items():
+        part = partition_dir(out_dir, family, source_file)
+        if part.exists():
+            shutil.rmtree(part)
+        n = len(columns["table_key"])
+        if n == 0:
+            continue
+        part.mkdir(parents=True)
+        table = pa.Table.from_pydict(columns, schema=family_schema(family))
+        pq.write_table(table, part / "part-0.parquet")
+        rows += n
+    return rows
+
+
+def export_workbook_json(
+    path: Path, out_dir: Path = PARQUET_DIR
+) -> Tuple[int, Optional[Path]]:
+    structured = process_workbook_json(path)
+    if structured is None:
+        return 0, None
+    return write_parquet_datasets(structured, path.name, out_dir), out_dir
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Export structured results as per-family Parquet datasets."
+    )
+    parser.add_argument(
+        "--out", type=Path, default=PARQUET_DIR, help="dataset root directory"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes, one workbook per task (0 = one per CPU core)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        print("[ERROR] Parquet export needs pyarrow: pip install pyarrow")
+        return
+
+    workbook_jsons = sorted(
+        p for p in OUTPUT_DIR.glob("*.json") if not p.name.startswith("structured_")
+    )
+    if not workbook_jsons:
+        print("[ERROR] No workbook JSON files found.")
+        return
+    task = partial(export_workbook_json, out_dir=args.out)
+    run_batch(task, workbook_jsons, args.workers)
+    print("[DONE]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+def is_period_key(key: str) -> bool:
+    """
+    True for the period keys of the structured output: "ttm" and the
+    "fy_YYYY_YY" keys transform_sections.fy_header_keys produces.
+    """
+    return key == "ttm" or key.startswith("fy_")
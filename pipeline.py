@@ -0,0 +1,123 @@
+import argparse
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from batch import add_batch_args, count_rows, run_batch
+from excel_to_json import (
+    BASE_DIR,
+    DATA_DIR,
+    FILE_PATTERN,
+    OUTPUT_DIR,
+    workbook_to_json,
+)
+from gstin_index import (
+    GSTIN_INDEX_NAME,
+    GstinIndex,
+    collect_counterparties,
+    prune_reports,
+    report_id,
+)
+from json_writer import open_for_replace
+from manifest import output_version, run_incremental_batch
+from profiling import add_profile_args, profile_from_args
+from result_cache import ResultCache, content_key
+from transform_sections import (
+    PARSER_VERSION,
+    process_workbook_dict,
+    write_structured_json,
+)
+
+CACHE_DIR = BASE_DIR / "cache"
+MANIFEST_NAME = ".pipeline.manifest"
+
+
+def save_structured_json(
+    structured: Dict[str, Any], excel_file: Path, indent: Optional[int] = 2
+) -> Path:
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = OUTPUT_DIR / f"structured_{excel_file.with_suffix('.json').name}"
+    with open_for_replace(out_path) as f:
+        write_structured_json(
+            f, structured.get("file_name"), structured["tables"].items(), indent
+        )
+    return out_path
+
+
+def index_counterparties(
+    excel_file: Path, structured: Optional[Dict[str, Any]]
+) -> None:
+    tables = structured["tables"].items() if structured is not None else ()
+    with GstinIndex(OUTPUT_DIR / GSTIN_INDEX_NAME) as index:
+        index.update_report(report_id(excel_file), collect_counterparties(tables))
+
+
+def convert_workbook(
+    excel_file: Path, use_cache: bool = True, indent: Optional[int] = 2
+) -> Tuple[int, Optional[Path]]:
+    cache = ResultCache(CACHE_DIR) if use_cache else None
+    key = ""
+    if cache is not None:
+        key = content_key(excel_file.read_bytes(), f"cli:{excel_file.name}")
+        cached = cache.get(key)
+        if cached is not None:
+            index_counterparties(excel_file, cached)
+            # nothing was parsed, so no rows are counted
+            return 0, save_structured_json(cached, excel_file, indent)
+
+    wb_json = workbook_to_json(excel_file)
+    structured = process_workbook_dict(wb_json, excel_file.name)
+    index_counterparties(excel_file, structured)
+    if structured is None:
+        return count_rows(wb_json), None
+    if cache is not None:
+        cache.put(key, structured)
+    return count_rows(wb_json), save_structured_json(structured, excel_file, indent)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Convert GST workbooks straight to structured JSON."
+    )
+    add_batch_args(parser)
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always reparse, ignoring cached results for unchanged files",
+    )
+    add_profile_args(parser)
+    args = parser.parse_args(argv)
+
+    excel_files = sorted(DATA_DIR.glob(FILE_PATTERN))
+    if not excel_files:
+        print("[ERROR] No Excel files found in 'data' folder.")
+        return
+
+    use_cache = not args.no_cache
+    if use_cache and (args.profile or args.pstats):
+        # a cache hit skips every stage worth profiling
+        print("[INFO] Profiling reparses every file; ignoring the result cache")
+        use_cache = False
+    task = partial(
+        convert_workbook,
+        use_cache=use_cache,
+        indent=None if args.compact else 2,
+    )
+    with profile_from_args(args):
+        if args.incremental:
+            run_incremental_batch(
+                task,
+                excel_files,
+                args.workers,
+                OUTPUT_DIR / MANIFEST_NAME,
+                output_version(PARSER_VERSION, "compact" if args.compact else ""),
+                on_prune=partial(prune_reports, OUTPUT_DIR / GSTIN_INDEX_NAME),
+            )
+        else:
+            run_batch(task, excel_files, args.workers)
+
+    print("[DONE]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import argparse
+import cProfile
+from contextvars import ContextVar
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import (
+    Any,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+# (stage, sheet, name), e.g. ("parse", "State Wise", "state_wise_fy")
+TimingKey = Tuple[str, str, str]
+T = TypeVar("T")
+
+_NULL = nullcontext()
+# per context, so concurrent runs (e.g. Streamlit sessions, each in its
+# own thread) never see each other's profiler
+_active: ContextVar[Optional["Profiler"]] = ContextVar("profiler", default=None)
+
+
+class Profiler:
+    """
+    Wall-clock totals per (stage, sheet, name) plus named counters. Time
+    spent in a nested timer counts for that timer only, not the outer one.
+    """
+
+    def __init__(self):
+        self.timings: Dict[TimingKey, List[float]] = {}
+        self.counters: Dict[str, int] = {}
+        # total seconds of the timers closed so far, nested ones included
+        self.closed = 0.0
+
+    def add(self, key: TimingKey, seconds: float) -> None:
+        entry = self.timings.get(key)
+        if entry is None:
+            self.timings[key] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """
+        One dict per timing key, slowest first.
+        """
+        out = [
+            {
+                "stage": stage,
+                "sheet": sheet,
+                "name": name,
+                "calls": int(calls),
+                "total_ms": round(seconds * 1000, 3),
+                "mean_ms": round(seconds * 1000 / calls, 3),
+            }
+            for (stage, sheet, name), (calls, seconds) in self.timings.items()
+        ]
+        out.sort(key=lambda r: r["total_ms"], reverse=True)
+        return out
+
+    def stage_totals(self) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        for (stage, _, _), (_, seconds) in self.timings.items():
+            totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+
+    def report(self, limit: int = 30) -> str:
+        lines = ["[PROFILE] stage totals:"]
+        for stage, seconds in sorted(
+            self.stage_totals().items(), key=lambda kv: kv[1], reverse=True
+        ):
+            lines.append(f"[PROFILE]   {stage:<10} {seconds * 1000:10.1f} ms")
+        lines.append(
+            f"[PROFILE] {'stage':<10} {'sheet':<28} {'name':<26} "
+            f"{'calls':>6} {'total ms':>10} {'mean ms':>9}"
+        )
+        for r in self.rows()[:limit]:
+            lines.append(
+                f"[PROFILE] {r['stage']:<10} {r['sheet'][:28]:<28} "
+                f"{r['name'][:26]:<26} {r['calls']:>6} "
+                f"{r['total_ms']:>10.1f} {r['mean_ms']:>9.3f}"
+            )
+        if self.counters:
+            counts = ", ".join(f"{k}={v}" for k, v in sorted(self.counters.items()))
+            lines.append(f"[PROFILE] counters: {counts}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def _timing(profiler: Profiler, key: TimingKey) -> Iterator[None]:
+    t0 = time.perf_counter()
+    closed0 = profiler.closed
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        profiler.add(key, elapsed - (profiler.closed - closed0))
+        profiler.closed = closed0 + elapsed
+
+
+def timer(stage: str, sheet: str = "", name: str = "") -> ContextManager[None]:
+    """
+    Time the block under (stage, sheet, name); a shared no-op context
+    unless a `profiling()` block is active.
+    """
+    profiler = _active.get()
+    if profiler is None:
+        return _NULL
+    return _timing(profiler, (stage, sheet, name))
+
+
+def timed_iter(
+    items: Iterable[T], stage: str, sheet: str = "", name: str = ""
+) -> Iterator[T]:
+    """
+    Iterate `items`, timing only the production of each item, e.g. rows
+    read lazily from a file, apart from the work done on them.
+    """
+    profiler = _active.get()
+    if profiler is None:
+        return iter(items)
+    return _timed_items(profiler, (stage, sheet, name), iter(items))
+
+
+def _timed_items(
+    profiler: Profiler, key: TimingKey, items: Iterator[T]
+) -> Iterator[T]:
+    end = object()
+    while True:
+        with _timing(profiler, key):
+            item = next(items, end)
+        if item is end:
+            return
+        yield item
+
+
+def count(name: str, n: int = 1) -> None:
+    profiler = _active.get()
+    if profiler is not None:
+        profiler.count(name, n)
+
+
+@contextmanager
+def profiling(pstats_path: Optional[Path] = None) -> Iterator[Profiler]:
+    """
+    Activate a fresh Profiler for the block, optionally under cProfile
+    with its stats dumped to `pstats_path` (read with `python -m pstats`).
+    """
+    profiler = Profiler()
+    token = _active.set(profiler)
+    cprof = cProfile.Profile() if pstats_path is not None else None
+    if cprof is not None:
+        cprof.enable()
+    try:
+        yield profiler
+    finally:
+        if cprof is not None:
+            cprof.disable()
+            cprof.dump_stats(str(pstats_path))
+        _active.reset(token)
+
+
+def add_profile_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print per-stage, per-sheet and per-parser timings",
+    )
+    parser.add_argument(
+        "--pstats",
+        type=Path,
+        metavar="FILE",
+        help="also write cProfile stats to FILE (implies --profile)",
+    )
+
+
+@contextmanager
+def profile_from_args(args: argparse.Namespace) -> Iterator[None]:
+    """
+    Profile the block when --profile/--pstats was given. Timers live in
+    this process, so the batch is forced onto a single worker.
+    """
+    if not (args.profile or args.pstats):
+        yield
+        return
+    if getattr(args, "workers", 1) != 1:
+        print("[INFO] Profiling runs in-process; ignoring --workers")
+        args.workers = 1
+    with profiling(args.pstats) as profiler:
+        yield
+    print(profiler.report())
+    if args.pstats:
+        print(f"[PROFILE] cProfile stats written to {args.pstats}")
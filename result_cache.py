@@ -0,0 +1,123 @@
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from json_writer import dumps, load
+from transform_sections import PARSER_VERSION
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024
+
+
+def content_key(data: bytes, variant: str = "") -> str:
+    """
+    SHA-256 of the input bytes, stamped with the parser version.
+
+    `variant` separates results of different extraction paths for the
+    same bytes (e.g. the CLI and the Streamlit loader).
+    """
+    h = hashlib.sha256()
+    h.update(f"{PARSER_VERSION}\0{variant}\0".encode("utf-8"))
+    h.update(data)
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of structured results, evicted least-recently-used
+    once the entries exceed `max_bytes` in total.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_path(key)
+        try:
+            value = load(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        try:
+            # mtime is the recency stamp used for eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(dumps(value, indent=None))
+            os.replace(tmp_name, self._entry_path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+class MemoryCache:
+    """
+    In-memory LRU of payloads, evicted least recently used once their
+    total size exceeds `max_bytes`. The size of a str or bytes value is
+    its length; other values pass theirs to `put`.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_BYTES):
+        self.max_bytes = max_bytes
+        self.total = 0
+        self.entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            return default
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: str, value: Any, size: Optional[int] = None) -> None:
+        if size is None:
+            size = len(value) if isinstance(value, (str, bytes)) else 0
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.total -= old[1]
+        self.entries[key] = (value, size)
+        self.total += size
+        # the newest entry stays even if it alone exceeds the bound
+        while self.total > self.max_bytes and len(self.entries) > 1:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.total -= evicted
@@ -1,106 +1,251 @@
-import io
-import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+import importlib
+from itertools import chain
+import math
+import multiprocessing
+import os
 from pathlib import Path
+import tempfile
 import zipfile
 
+import pandas as pd
 import streamlit as st
-from openpyxl import load_workbook
 
-from transform_sections import process_workbook_json
-
-
-BASE_DIR = Path(__file__).resolve().parent
-TMP_DIR = BASE_DIR / "tmp"
-TMP_DIR.mkdir(exist_ok=True)
+from json_writer import dumps, loads
+from profiling import profiling, timer
+from result_cache import MemoryCache, ResultCache, content_key
+from transform_sections import process_workbook_dict
+from workbook_reader import iter_sheet_tables, open_workbook
+
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "results"
+RESULT_CACHE = ResultCache(CACHE_DIR)
+WORKERS = os.cpu_count() or 1
+MEMO_MAX_BYTES = 64 * 1024 * 1024
+# a structured dict takes about twice the memory of its JSON text
+# (1.9-2.0x on the sample reports)
+STRUCTURED_BYTES_PER_JSON_BYTE = 2
+PREVIEW_PAGE_SIZE = 50
+# ZIP bundles larger than this spill from memory to a temporary file
+ZIP_SPOOL_BYTES = 32 * 1024 * 1024
+ZIP_COMPRESSION = {
+    "Deflate (balanced)": (zipfile.ZIP_DEFLATED, 6),
+    "Deflate (fastest)": (zipfile.ZIP_DEFLATED, 1),
+    "Deflate (smallest)": (zipfile.ZIP_DEFLATED, 9),
+    "Store (no compression)": (zipfile.ZIP_STORED, None),
+}
 
 
 def excel_to_workbook_dict(file_bytes: bytes, file_name: str) -> dict:
-    wb = load_workbook(io.BytesIO(file_bytes), data_only=True)
+    wb = open_workbook(file_bytes)
     sheets: dict[str, dict] = {}
 
-    for ws in wb.worksheets:
-        rows = list(ws.iter_rows(values_only=True))
-        if not rows:
-            continue
-
-        segments: list[tuple[int, int]] = []
-        in_segment = False
-        start_idx = 0
-
-        for idx, row in enumerate(rows):
-            has_data = any(
-                (cell is not None and str(cell).strip() != "") for cell in row
-            )
-            if has_data and not in_segment:
-                in_segment = True
-                start_idx = idx
-            elif not has_data and in_segment:
-                segments.append((start_idx, idx - 1))
-                in_segment = False
-
-        if in_segment:
-            segments.append((start_idx, len(rows) - 1))
-
-        tables = []
-        for start, end in segments:
-            segment_rows = rows[start : end + 1]
-
-            min_col = None
-            max_col = None
-            for r in segment_rows:
-                for j, cell in enumerate(r):
-                    if cell is not None and str(cell).strip() != "":
-                        if min_col is None or j < min_col:
-                            min_col = j
-                        if max_col is None or j > max_col:
-                            max_col = j
-
-            if min_col is None:
-                continue
-
-            data = []
-            for r in segment_rows:
-                row_vals = []
-                for j in range(min_col, max_col + 1):
-                    if j < len(r):
-                        row_vals.append(r[j])
-                    else:
-                        row_vals.append(None)
-                data.append(row_vals)
-
-            tables.append(
-                {
-                    "start_row": start + 1,
-                    "start_col": min_col + 1,
-                    "row_count": len(data),
-                    "column_count": max_col - min_col + 1,
-                    "data": data,
-                }
-            )
-
-        sheets[ws.title] = {"tables": tables}
+    try:
+        for ws in wb.worksheets:
+            tables = []
+            with timer("segment", ws.title):
+                blocks = list(iter_sheet_tables(ws))
+            for block in blocks:
+                tables.append(
+                    {
+                        "start_row": block.start_row + 1,
+                        "start_col": block.start_col + 1,
+                        "row_count": len(block.rows),
+                        "column_count": block.end_col - block.start_col + 1,
+                        "data": block.rows,
+                    }
+                )
+            if tables:
+                sheets[ws.title] = {"tables": tables}
+    finally:
+        wb.close()
 
     return {"file_name": file_name, "sheets": sheets}
 
 
-def transform_uploaded_file(file_bytes: bytes, file_name: str) -> dict | None:
+def upload_key(file_bytes: bytes, file_name: str) -> str:
+    return content_key(file_bytes, f"app:{file_name}")
+
+
+def transform_uploaded_file(
+    file_bytes: bytes, file_name: str, use_cache: bool = True
+) -> dict | None:
     suffix = Path(file_name).suffix.lower()
 
-    if suffix == ".json":
-        tmp_path = TMP_DIR / f"raw_{file_name}"
-        tmp_path.write_bytes(file_bytes)
-        return process_workbook_json(tmp_path)
+    if suffix not in (".json", ".xlsx", ".xls"):
+        raise ValueError("Unsupported file type. Please upload .json, .xlsx or .xls.")
 
-    if suffix in (".xlsx", ".xls"):
+    key = upload_key(file_bytes, file_name)
+    cached = RESULT_CACHE.get(key) if use_cache else None
+    if cached is not None:
+        return cached
+
+    if suffix == ".json":
+        workbook_dict = loads(file_bytes)
+    else:
         workbook_dict = excel_to_workbook_dict(file_bytes, file_name)
-        tmp_json_path = TMP_DIR / f"{Path(file_name).stem}_workbook.json"
-        tmp_json_path.write_text(
-            json.dumps(workbook_dict, ensure_ascii=False), encoding="utf-8"
-        )
-        return process_workbook_json(tmp_json_path)
+    structured = process_workbook_dict(workbook_dict, file_name)
+
+    if structured is not None:
+        RESULT_CACHE.put(key, structured)
+    return structured
+
+
+def process_upload(
+    file_bytes: bytes, file_name: str, use_cache: bool = True
+) -> tuple[dict, bytes] | None:
+    """
+    (structured result, its UTF-8 JSON) for one upload, or None if no
+    tables were parsed. Runs in a pool worker; the JSON bytes are then
+    shared by the download button and the ZIP bundle.
+    """
+    structured = transform_uploaded_file(file_bytes, file_name, use_cache)
+    if not structured:
+        return None
+    with timer("serialize", name=file_name):
+        return structured, dumps(structured).encode("utf-8")
+
+
+def build_zip_bundle(
+    entries: list[tuple[str, bytes]],
+    compression: int = zipfile.ZIP_DEFLATED,
+    compresslevel: int | None = None,
+    spool_bytes: int = ZIP_SPOOL_BYTES,
+) -> tempfile.SpooledTemporaryFile:
+    """
+    Write already-encoded (name, bytes) entries one at a time into a ZIP
+    held in memory up to `spool_bytes` and on disk beyond. The file is
+    returned rewound.
+    """
+    bundle = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+    with zipfile.ZipFile(
+        bundle, "w", compression=compression, compresslevel=compresslevel
+    ) as zf:
+        for out_name, data in entries:
+            zf.writestr(out_name, data)
+    bundle.seek(0)
+    return bundle
+
+
+def read_zip_bundle(
+    entries: list[tuple[str, bytes]], compression: int, compresslevel: int | None
+) -> bytes:
+    with build_zip_bundle(entries, compression, compresslevel) as bundle:
+        return bundle.read()
+
+
+@st.cache_resource
+def get_worker_pool(workers: int) -> ProcessPoolExecutor:
+    # shared by every session and rerun; processes start on first submit.
+    # Spawned, not forked: the Streamlit server runs threads a fork would
+    # copy mid-flight.
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
 
-    st.error("Unsupported file type. Please upload .json, .xlsx or .xls.")
-    return None
+
+def result_size(result: tuple[dict, bytes] | None) -> int:
+    """
+    Memory estimate of a memoized (structured dict, JSON bytes) result.
+    """
+    if result is None:
+        return 0
+    return len(result[1]) * (1 + STRUCTURED_BYTES_PER_JSON_BYTE)
+
+
+def session_memo() -> MemoryCache:
+    """
+    Encoded results of this session, keyed by content hash, so reruns
+    from widget changes skip parsing and encoding entirely.
+    """
+    if "memo" not in st.session_state:
+        st.session_state["memo"] = MemoryCache(MEMO_MAX_BYTES)
+    return st.session_state["memo"]
+
+
+def iter_processed(uploads: dict[int, tuple[str, bytes]], in_process: bool):
+    """
+    Yield (index, process_upload result, error or None) per upload as
+    each one finishes. A failing upload never holds back the others.
+    """
+    if in_process:
+        for i, (name, file_bytes) in uploads.items():
+            try:
+                yield i, process_upload(file_bytes, name, use_cache=False), None
+            except Exception as e:
+                yield i, None, e
+        return
+
+    # Streamlit runs this file as __main__, which workers cannot import;
+    # submit the function of the importable module instead
+    task = importlib.import_module("streamlit_app").process_upload
+    pool = get_worker_pool(WORKERS)
+    futures = {
+        pool.submit(task, file_bytes, name): i
+        for i, (name, file_bytes) in uploads.items()
+    }
+    for future in as_completed(futures):
+        try:
+            yield futures[future], future.result(), None
+        except BrokenProcessPool as e:
+            # a crashed worker breaks the pool; start a fresh one next run
+            get_worker_pool.clear()
+            yield futures[future], None, e
+        except Exception as e:
+            yield futures[future], None, e
+
+
+def show_metrics(metrics, key: str) -> None:
+    """
+    One page of a table's metrics; the browser never gets more than
+    PREVIEW_PAGE_SIZE rows at a time.
+    """
+    if not isinstance(metrics, list):
+        st.json(metrics)
+        return
+    pages = max(1, math.ceil(len(metrics) / PREVIEW_PAGE_SIZE))
+    page = 1
+    if pages > 1:
+        page = st.number_input(
+            f"Page (of {pages})", min_value=1, max_value=pages, key=f"page_{key}"
+        )
+    start = (page - 1) * PREVIEW_PAGE_SIZE
+    rows = metrics[start : start + PREVIEW_PAGE_SIZE]
+    if rows and all(isinstance(r, dict) for r in rows):
+        df = pd.DataFrame(rows)
+        # amounts sit next to "-" or rank labels; Arrow needs one type
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].map(lambda v: v if v is None else str(v))
+        st.dataframe(df)
+    else:
+        st.json(rows)
+
+
+def show_result(
+    name: str, out_name: str, structured: dict, formatted: bytes
+) -> None:
+    tables = structured.get("tables", {})
+    st.markdown(f"**{name}**")
+    st.success(f"Structured JSON generated: {len(tables)} table(s)")
+    if tables:
+        table_key = st.selectbox("Table", list(tables), key=f"table_{out_name}")
+        table = tables[table_key]
+        st.caption(
+            f"{table.get('sheet')} · {table.get('section_title')} · "
+            f"{table.get('row_count')} rows x {table.get('column_count')} columns"
+        )
+        show_metrics(table.get("metrics"), f"{out_name}_{table_key}")
+    st.download_button(
+        label="Download JSON",
+        file_name=out_name,
+        mime="application/json",
+        # handed over only when clicked, without rerunning the script
+        data=lambda: formatted,
+        on_click="ignore",
+        key=f"dl_json_{out_name}",
+    )
 
 
 def apply_theme(theme: str) -> None:
@@ -136,6 +281,27 @@ def apply_theme(theme: str) -> None:
     st.markdown(css, unsafe_allow_html=True)
 
 
+def show_profile(profiler, pstats_path: Path) -> None:
+    pstats_bytes = pstats_path.read_bytes()
+    pstats_path.unlink()
+    with st.expander("Profile", expanded=True):
+        totals = profiler.stage_totals()
+        cols = st.columns(len(totals) or 1)
+        for col, (stage, seconds) in zip(cols, sorted(totals.items())):
+            col.metric(stage, f"{seconds * 1000:.1f} ms")
+        st.write(
+            ", ".join(f"{k}: {v}" for k, v in sorted(profiler.counters.items()))
+        )
+        st.dataframe(profiler.rows())
+        st.download_button(
+            "Download cProfile stats",
+            data=pstats_bytes,
+            file_name="structured_json.pstats",
+            mime="application/octet-stream",
+            key="dl_pstats",
+        )
+
+
 def main():
     st.set_page_config(page_title="GST Workbook Transformer", layout="wide")
 
@@ -156,60 +322,85 @@ def main():
         accept_multiple_files=True,
     )
 
+    run_profile = st.checkbox(
+        "Profile processing",
+        help="Skip the result cache and time loading, parsing and serialization.",
+    )
+
     if not uploaded_files:
         return
 
-    results: list[tuple[str, dict]] = []
-
-    for upl in uploaded_files:
-        file_bytes = upl.read()
-        try:
-            structured = transform_uploaded_file(file_bytes, upl.name)
-        except Exception as e:
-            st.error(f"Error while processing {upl.name}: {e}")
-            continue
-
-        if structured:
-            results.append((upl.name, structured))
-        else:
-            st.warning(f"No structured tables produced for {upl.name}.")
-
-    if not results:
-        return
+    uploads = [(upl.name, upl.read()) for upl in uploaded_files]
+    keys = [upload_key(file_bytes, name) for name, file_bytes in uploads]
+    memo = session_memo()
+    pstats_path = None
+    if run_profile:
+        fd, pstats_name = tempfile.mkstemp(suffix=".pstats")
+        os.close(fd)
+        pstats_path = Path(pstats_name)
 
     st.markdown("---")
     st.subheader("Structured JSON Preview")
+    progress = st.progress(0.0, text=f"Processing {len(uploads)} file(s)...")
 
+    # one placeholder per upload, filled in as its result arrives
     max_cols = 3
-    for i in range(0, len(results), max_cols):
-        row = results[i : i + max_cols]
-        cols = st.columns(len(row))
-        for col, (name, data) in zip(cols, row):
-            with col:
-                st.markdown(f"**{name}**")
-                st.success("Structured JSON generated")
-                formatted = json.dumps(data, ensure_ascii=False, indent=2)
-                st.code(formatted, language="json")
-                out_name = f"structured_{Path(name).stem}.json"
-                st.download_button(
-                    label="Download JSON",
-                    file_name=out_name,
-                    mime="application/json",
-                    data=formatted.encode("utf-8"),
-                    key=f"dl_json_{out_name}",
-                )
+    slots = []
+    for i in range(0, len(uploads), max_cols):
+        cols = st.columns(min(max_cols, len(uploads) - i))
+        for col, (name, _) in zip(cols, uploads[i : i + max_cols]):
+            slot = col.empty()
+            slot.info(f"Processing {name}...")
+            slots.append(slot)
+
+    # profile runs redo everything; otherwise only unseen content is parsed
+    memoized = []
+    pending: dict[int, tuple[str, bytes]] = {}
+    for i, key in enumerate(keys):
+        if not run_profile and key in memo:
+            memoized.append((i, memo.get(key), None))
+        else:
+            pending[i] = uploads[i]
+
+    done: dict[int, tuple[str, bytes]] = {}
+    # profiling timers live in this process, so profile runs skip the pool
+    with profiling(pstats_path) if run_profile else nullcontext() as profiler:
+        for n, (i, result, error) in enumerate(
+            chain(memoized, iter_processed(pending, in_process=run_profile)),
+            start=1,
+        ):
+            name = uploads[i][0]
+            if error is None:
+                memo.put(keys[i], result, size=result_size(result))
+            with slots[i].container():
+                if error is not None:
+                    st.error(f"Error while processing {name}: {error}")
+                elif result is None:
+                    st.warning(f"No structured tables produced for {name}.")
+                else:
+                    structured, formatted = result
+                    out_name = f"structured_{Path(name).stem}.json"
+                    done[i] = (out_name, formatted)
+                    show_result(name, out_name, structured, formatted)
+            progress.progress(n / len(uploads), text=f"{n}/{len(uploads)} done")
+
+    if profiler is not None:
+        show_profile(profiler, pstats_path)
+
+    if not done:
+        return
 
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for name, data in results:
-            fname = f"structured_{Path(name).stem}.json"
-            zf.writestr(fname, json.dumps(data, ensure_ascii=False, indent=2))
-    zip_buffer.seek(0)
+    # ZIP entries keep upload order, whatever order the workers finished in
+    encoded = [done[i] for i in sorted(done)]
 
     st.markdown("---")
+    level = st.selectbox("ZIP compression", list(ZIP_COMPRESSION), key="zip_level")
+    compression, compresslevel = ZIP_COMPRESSION[level]
     st.download_button(
         "Download all structured JSON as ZIP",
-        data=zip_buffer.getvalue(),
+        # built only when clicked, from the bytes already encoded above
+        data=lambda: read_zip_bundle(encoded, compression, compresslevel),
+        on_click="ignore",
         file_name="structured_json_bundle.zip",
         mime="application/zip",
         key="dl_zip_all",
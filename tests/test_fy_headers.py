@@ -0,0 +1,29 @@
+from periods import is_period_key
+from transform_sections import extract_fy_columns, fy_header_keys
+
+
+def test_fy_header_keys():
+    assert fy_header_keys("FY 2024-25") == ("fy_2024_25",)
+    assert fy_header_keys("TTM (Nov-24 to Oct-25)") == ("ttm",)
+    assert fy_header_keys("TTM / FY 2024-25 / FY 2023-24") == (
+        "fy_2023_24",
+        "fy_2024_25",
+        "ttm",
+    )
+
+
+def test_four_digit_end_year_is_not_a_period():
+    assert fy_header_keys("FY 2023-2024") == ()
+    header = ["PARTICULARS", "FY 2023-2024", None, "FY 2024-2025"]
+    assert extract_fy_columns(header) == {}
+
+
+def test_header_label_spreads_over_empty_cells():
+    header = ["PARTICULARS", "FY 2023-24", None, "TTM", None]
+    assert extract_fy_columns(header) == {"fy_2023_24": [1, 2], "ttm": [3, 4]}
+
+
+def test_header_keys_are_period_keys():
+    keys = fy_header_keys("TTM / FY 2024-25 / FY 2023-24")
+    assert all(is_period_key(key) for key in keys)
+    assert not is_period_key("particulars")
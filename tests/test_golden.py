@@ -0,0 +1,21 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.golden_regression import (
+    DATA_DIR,
+    OUTPUT_DIR,
+    cli_path,
+    deep_diff,
+    raw_json_path,
+)
+from json_writer import load
+
+SAMPLES = sorted(DATA_DIR.glob("*.xlsx"))
+
+
+@pytest.mark.parametrize("code_path", [cli_path, raw_json_path])
+@pytest.mark.parametrize("xlsx", SAMPLES, ids=[p.name for p in SAMPLES])
+def test_matches_golden_output(xlsx: Path, code_path):
+    golden = load(OUTPUT_DIR / f"structured_{xlsx.with_suffix('.json').name}")
+    assert deep_diff(golden, code_path(xlsx)) == []
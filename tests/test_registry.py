@@ -0,0 +1,63 @@
+import pytest
+
+import transform_sections
+from transform_sections import (
+    process_workbook_dict,
+    register_sheet_parsers,
+    register_table_parser,
+    stateless_parser,
+)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(
+        transform_sections, "TABLE_PARSERS", dict(transform_sections.TABLE_PARSERS)
+    )
+    monkeypatch.setattr(
+        transform_sections, "SHEET_PARSERS", list(transform_sections.SHEET_PARSERS)
+    )
+
+
+def parse_notes(matrix):
+    if matrix[0][0] != "NOTES":
+        return None
+    return {
+        "section_title": "Notes",
+        "metrics": [{"note": row[0]} for row in matrix[1:]],
+    }
+
+
+def test_registered_one_argument_parser(registry):
+    register_table_parser("notes", stateless_parser(parse_notes))
+    register_sheet_parsers("remarks*", ["notes", "simple_text"])
+    wb = {
+        "file_name": "sample.xlsx",
+        "sheets": {
+            "Remarks 2024": {
+                "tables": [
+                    {
+                        "table_index": 1,
+                        "start_row": 1,
+                        "start_col": 1,
+                        "row_count": 3,
+                        "column_count": 1,
+                        "data": [["NOTES"], ["Filed late"], ["Paid in full"]],
+                    }
+                ]
+            }
+        },
+    }
+    stats = []
+    structured = process_workbook_dict(wb, stats=stats)
+
+    table = structured["tables"]["Remarks 2024_notes"]
+    assert table["metrics"] == [{"note": "Filed late"}, {"note": "Paid in full"}]
+    assert stats == [
+        {
+            "sheet": "Remarks 2024",
+            "table_index": 1,
+            "parser": "notes",
+            "key": "Remarks 2024_notes",
+        }
+    ]
@@ -1,30 +1,116 @@
-import json
+import argparse
+import re
+from fnmatch import fnmatchcase
+from functools import lru_cache, partial
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Optional, Set
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Tuple,
+    Optional,
+    Sequence,
+    Set,
+)
+
+from batch import add_batch_args, count_rows, run_batch
+from cell_table import DENSE_FORMAT, RAW_FORMATS, CellTable, Matrix
+from gstin_index import (
+    GSTIN_INDEX_NAME,
+    Counterparties,
+    GstinIndex,
+    prune_reports,
+    report_id,
+    tap_counterparties,
+)
+from json_writer import load, open_for_replace, write_json_stream
+from manifest import output_version, run_incremental_batch
+from profiling import add_profile_args, profile_from_args, timer
 
 BASE_DIR = Path(r"D:\Aadiswan Task")
 OUTPUT_DIR = BASE_DIR / "output"
 
+# Bump whenever extraction or parsing changes the structured output, so
+# cached and incremental results from older code are not reused.
+PARSER_VERSION = "3"
+MANIFEST_NAME = ".transform_sections.manifest"
 
-def clean_number(value: Any) -> Any:
-    if value is None:
-        return None
-    if isinstance(value, (int, float)):
-        return float(value)
-    s = str(value).strip()
-    if s == "":
-        return None
-    if s in ("-", "--", "NA", "N/A"):
+
+NULL_TOKENS = frozenset(("-", "--", "NA", "N/A"))
+# Plain decimal literals; float() always accepts these.
+NUMERIC_RE = re.compile(r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?")
+# Anything float() could still accept (underscores, inf/nan, inner spaces).
+FLOAT_LIKE_RE = re.compile(
+    r"[\d_.eE+\-\s]*|\s*[+-]?(?:inf(?:inity)?|nan)\s*", re.IGNORECASE
+)
+
+
+# First characters a float literal can start with, once stripped.
+FLOAT_START_CHARS = frozenset("0123456789+-.,%iInN")
+
+# Period labels of FY table headers, matched on upper-cased text.
+FY_HEADER_RE = re.compile(r"FY (\d{4})-(\d{2})(?!\d)|TTM")
+
+
+def _coerce_text(s: str, value: Any) -> Any:
+    if s == "" or s in NULL_TOKENS:
         return None
+    if s[0] not in FLOAT_START_CHARS and not s[0].isdigit():
+        return value
     s = s.replace(",", "")
     if s.endswith("%"):
         s = s[:-1]
+    if NUMERIC_RE.fullmatch(s):
+        return float(s)
+    if not FLOAT_LIKE_RE.fullmatch(s):
+        return value
     try:
         return float(s)
     except Exception:
         return value
 
 
+def clean_number(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return _coerce_text(str(value).strip(), value)
+
+
+def clean_numbers(
+    values: Iterable[Any], seen: Optional[Dict[str, Any]] = None
+) -> List[Any]:
+    """
+    `clean_number` over a whole row or column in one pass. Pass the same
+    `seen` dict to share converted strings between calls.
+    """
+    out: List[Any] = []
+    append = out.append
+    if seen is None:
+        seen = {}
+    for v in values:
+        if v is None:
+            append(None)
+        elif isinstance(v, (int, float)):
+            append(float(v))
+        elif type(v) is str:
+            # labels and blanks repeat a lot within a block
+            if v not in seen:
+                seen[v] = _coerce_text(v.strip(), v)
+            append(seen[v])
+        else:
+            append(_coerce_text(str(v).strip(), v))
+    return out
+
+
 def is_number_token(tok: str) -> bool:
     s = tok.strip()
     if s == "":
@@ -39,23 +125,94 @@ def is_number_token(tok: str) -> bool:
         return False
 
 
-def detect_header_row(matrix: List[List[Any]]) -> Optional[int]:
+class NormalizedTable:
+    """
+    A table matrix with the per-row text its parsers keep asking for
+    (non-blank cells, the header line) computed once, on first use, and
+    shared along the sheet's parser chain. Numbers converted from string
+    cells are memoized in `number_memo`, which the tables of a workbook
+    can share since the same "-" and amounts recur across sheets.
+    """
+
+    def __init__(
+        self,
+        matrix: Matrix,
+        number_memo: Optional[Dict[str, Any]] = None,
+    ):
+        self.raw = matrix
+        self.number_memo: Dict[str, Any] = (
+            {} if number_memo is None else number_memo
+        )
+        self._cells: List[Optional[List[str]]] = [None] * len(matrix)
+        self._lines: List[Optional[str]] = [None] * len(matrix)
+
+    @classmethod
+    def concat(cls, tables: List["NormalizedTable"]) -> "NormalizedTable":
+        """
+        The tables stacked vertically, keeping what each has computed.
+        """
+        out = cls(
+            [row for t in tables for row in t.raw],
+            tables[0].number_memo if tables else None,
+        )
+        out._cells = [c for t in tables for c in t._cells]
+        out._lines = [line for t in tables for line in t._lines]
+        return out
+
+    def numbers(self, values: Iterable[Any]) -> List[Any]:
+        """
+        `clean_numbers` of cells taken from this table.
+        """
+        return clean_numbers(values, self.number_memo)
+
+    def cells(self, i: int) -> List[str]:
+        """
+        Stripped text of the non-blank cells of row `i`.
+        """
+        cells = self._cells[i]
+        if cells is None:
+            cells = self._cells[i] = [
+                str(c).strip() for c in self.raw[i] if c not in (None, "", " ")
+            ]
+        return cells
+
+    def upper_line(self, i: int) -> str:
+        """
+        Upper-cased cells of row `i` joined by spaces, falsy cells as "".
+        """
+        line = self._lines[i]
+        if line is None:
+            line = self._lines[i] = " ".join(
+                [str(c).upper() if c else "" for c in self.raw[i]]
+            )
+        return line
+
+
+@lru_cache(maxsize=4096)
+def fy_header_keys(label: str) -> Tuple[str, ...]:
+    """
+    Output keys for the periods named in a header label, e.g.
+    "FY 2023-24" -> ("fy_2023_24",), years ascending and "ttm" last.
+    """
+    keys = {
+        f"fy_{m[1]}_{m[2]}" if m[1] else "ttm"
+        for m in FY_HEADER_RE.finditer(label.upper())
+    }
+    return tuple(sorted(keys, key=lambda k: (k == "ttm", k)))
+
+
+def detect_header_row(
+    matrix: Matrix, table: Optional[NormalizedTable] = None
+) -> Optional[int]:
+    if table is None:
+        table = NormalizedTable(matrix)
     for i, row in enumerate(matrix):
-        if not row:
-            continue
-        upper = [str(c).upper() if c else "" for c in row]
-        joined = " ".join(upper)
-        if (
-            "FY 2023-24" in joined
-            or "FY 2024-25" in joined
-            or "FY 2025-26" in joined
-            or "TTM" in joined
-        ):
+        if row and FY_HEADER_RE.search(table.upper_line(i)):
             return i
     return None
 
 
-def spread_header_labels(header_row: List[Any]) -> List[str]:
+def spread_header_labels(header_row: Sequence[Any]) -> List[str]:
     labels: List[str] = []
     current = ""
     for cell in header_row:
@@ -66,39 +223,35 @@ def spread_header_labels(header_row: List[Any]) -> List[str]:
     return labels
 
 
-def extract_fy_columns(header_row: List[Any]) -> Dict[str, List[int]]:
+def extract_fy_columns(header_row: Sequence[Any]) -> Dict[str, List[int]]:
     spread = spread_header_labels(header_row)
     fy_cols: Dict[str, List[int]] = {}
     for idx, text in enumerate(spread):
         if not text:
             continue
-        t = text.upper()
-        if "FY 2023-24" in t:
-            fy_cols.setdefault("fy_2023_24", []).append(idx)
-        if "FY 2024-25" in t:
-            fy_cols.setdefault("fy_2024_25", []).append(idx)
-        if "FY 2025-26" in t:
-            fy_cols.setdefault("fy_2025_26", []).append(idx)
-        if "TTM" in t:
-            fy_cols.setdefault("ttm", []).append(idx)
+        for key in fy_header_keys(text):
+            fy_cols.setdefault(key, []).append(idx)
     return fy_cols
 
 
 def detect_section_title(
-    matrix: List[List[Any]], header_idx: int, header_row: List[Any]
+    matrix: Matrix,
+    header_idx: int,
+    header_row: Sequence[Any],
+    table: Optional[NormalizedTable] = None,
 ) -> Optional[str]:
+    if table is None:
+        table = NormalizedTable(matrix)
     for i in range(header_idx - 1, -1, -1):
-        row = matrix[i]
-        if not row:
+        if not matrix[i]:
             continue
-        cells = [str(c).strip() for c in row if c not in (None, "", " ")]
+        cells = table.cells(i)
         if not cells:
             continue
-        text = " ".join(cells)
-        up = text.upper()
-        if up in ("PARTICULARS", "MONTH"):
+        title = " ".join(cells)
+        if title.upper() in ("PARTICULARS", "MONTH"):
             continue
-        return text
+        return title
     for cell in header_row:
         if cell not in (None, "", " "):
             return str(cell).strip()
@@ -120,72 +273,87 @@ def slug(text: str) -> str:
     return s or "section"
 
 
-def parse_fy_table(
-    matrix: List[List[Any]],
-    prev_context: Optional[Dict[str, Any]],
-) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], bool]:
-    header_idx = detect_header_row(matrix)
-    header_found = header_idx is not None
+class FyTableSpec(NamedTuple):
+    """
+    Layout of an FY table: the row label goes to `key_field`, an optional
+    identifier in the second column to `id_field`. Rows whose upper-cased
+    label equals one of `skip_labels` or contains one of `skip_containing`
+    are header repeats and are dropped.
+    """
 
-    if header_found:
-        header_row = matrix[header_idx]
-        fy_cols = extract_fy_columns(header_row)
-        if not fy_cols:
-            return None, prev_context, False
-        title = detect_section_title(matrix, header_idx, header_row)
-        start_data_row = header_idx + 1
-        context = {"fy_cols": fy_cols, "title": title}
-    else:
-        if not prev_context:
-            return None, prev_context, False
-        fy_cols = prev_context["fy_cols"]
-        title = prev_context["title"]
-        start_data_row = 0
-        context = prev_context
+    key_field: str = "metric"
+    id_field: Optional[str] = None
+    skip_labels: Tuple[str, ...] = ("PARTICULARS",)
+    skip_containing: Tuple[str, ...] = ()
 
-    records: List[Dict[str, Any]] = []
 
-    for row in matrix[start_data_row:]:
-        if not row:
-            continue
-        metric_raw = row[0] if len(row) > 0 else None
-        if metric_raw is None or str(metric_raw).strip() == "":
-            continue
-        metric = str(metric_raw).strip()
-        if metric.upper() == "PARTICULARS":
-            continue
-        item: Dict[str, Any] = {"metric": metric}
-        for key, col_indexes in fy_cols.items():
-            values: List[Any] = []
-            for col_idx in col_indexes:
-                v = row[col_idx] if col_idx < len(row) else None
-                if v is None or str(v).strip() == "":
-                    values.append(None)
-                else:
-                    values.append(clean_number(v))
-            if not values:
-                item[key] = None
-            elif len(values) == 1:
-                item[key] = values[0]
-            else:
-                item[key] = values
-        records.append(item)
+class FyColumnPlan(NamedTuple):
+    """
+    FY value columns of a header, flattened for a single gather per row.
+    `groups` holds (output key, offset, count) into the gathered values.
+    """
 
-    if not records:
-        return None, prev_context, header_found
+    columns: Tuple[int, ...]
+    groups: Tuple[Tuple[str, int, int], ...]
+    width: int
 
-    parsed_block = {
-        "section_title": title,
-        "metrics": records,
-    }
-    return parsed_block, context, header_found
 
+FY_TABLE_SPEC = FyTableSpec()
+STATE_WISE_SPEC = FyTableSpec(id_field="state_code")
+PRODUCT_WISE_SPEC = FyTableSpec(
+    key_field="product hsn ",
+    id_field="hsn_name",
+    skip_labels=("PRODUCT (HSN)", "PRODUCT HSN"),
+)
 
-def parse_state_wise_fy_table(
-    matrix: List[List[Any]],
+
+def party_spec(role: str) -> FyTableSpec:
+    skip = (role.upper(),) if role in ("customer", "supplier") else ()
+    return FyTableSpec(
+        key_field=f"{role} name " if role == "customer" else f"{role} name",
+        id_field=f"{role}_gstin",
+        skip_labels=(),
+        skip_containing=skip,
+    )
+
+
+def compile_fy_plan(fy_cols: Dict[str, List[int]]) -> FyColumnPlan:
+    columns: List[int] = []
+    groups: List[Tuple[str, int, int]] = []
+    for key, col_indexes in fy_cols.items():
+        groups.append((key, len(columns), len(col_indexes)))
+        columns.extend(col_indexes)
+    width = max(columns) + 1 if columns else 0
+    return FyColumnPlan(tuple(columns), tuple(groups), width)
+
+
+def gather_columns(rows: List[Sequence[Any]], plan: FyColumnPlan) -> List[Any]:
+    """
+    Values of the plan's columns for every row, row-major, None-padded.
+    """
+    if not plan.columns:
+        return []
+    take = itemgetter(*plan.columns)
+    pad = [None] * plan.width
+    flat: List[Any] = []
+    if len(plan.columns) == 1:
+        for row in rows:
+            flat.append(take(row if len(row) >= plan.width else [*row, *pad]))
+    else:
+        for row in rows:
+            flat.extend(take(row if len(row) >= plan.width else [*row, *pad]))
+    return flat
+
+
+def parse_fy_block(
+    matrix: Matrix,
     prev_context: Optional[Dict[str, Any]],
+    spec: FyTableSpec = FY_TABLE_SPEC,
+    table: Optional[NormalizedTable] = None,
 ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], bool]:
-    header_idx = detect_header_row(matrix)
+    if table is None:
+        table = NormalizedTable(matrix)
+    header_idx = detect_header_row(matrix, table)
     header_found = header_idx is not None
 
     if header_found:
@@ -193,7 +361,7 @@ def parse_state_wise_fy_table(
         fy_cols = extract_fy_columns(header_row)
         if not fy_cols:
             return None, prev_context, False
-        title = detect_section_title(matrix, header_idx, header_row)
+        title = detect_section_title(matrix, header_idx, header_row, table)
         start_data_row = header_idx + 1
         context = {"fy_cols": fy_cols, "title": title}
     else:
@@ -204,115 +372,89 @@ def parse_state_wise_fy_table(
         start_data_row = 0
         context = prev_context
 
-    records: List[Dict[str, Any]] = []
+    plan = context.get("plan")
+    if plan is None:
+        plan = compile_fy_plan(fy_cols)
+        context["plan"] = plan
 
+    items: List[Dict[str, Any]] = []
+    rows: List[Sequence[Any]] = []
     for row in matrix[start_data_row:]:
         if not row:
             continue
-        metric_raw = row[0] if len(row) > 0 else None
-        if metric_raw is None or str(metric_raw).strip() == "":
+        label_cell = row[0]
+        if label_cell is None:
             continue
-        metric = str(metric_raw).strip()
-        if metric.upper() == "PARTICULARS":
+        label = str(label_cell).strip()
+        if label == "":
             continue
-        item: Dict[str, Any] = {"metric": metric}
-        if len(row) > 1:
-            scell = row[1]
-            if scell not in (None, "", " "):
-                item["state_code"] = str(scell).strip()
-        for key, col_indexes in fy_cols.items():
-            values: List[Any] = []
-            for col_idx in col_indexes:
-                v = row[col_idx] if col_idx < len(row) else None
-                if v is None or str(v).strip() == "":
-                    values.append(None)
-                else:
-                    values.append(clean_number(v))
-            if not values:
-                item[key] = None
-            elif len(values) == 1:
-                item[key] = values[0]
-            else:
-                item[key] = values
-        records.append(item)
-
-    if not records:
+        up = label.upper()
+        if up in spec.skip_labels:
+            continue
+        if spec.skip_containing and any(s in up for s in spec.skip_containing):
+            continue
+        item: Dict[str, Any] = {spec.key_field: label}
+        if spec.id_field is not None and len(row) > 1:
+            id_cell = row[1]
+            if id_cell not in (None, "", " "):
+                item[spec.id_field] = str(id_cell).strip()
+        items.append(item)
+        rows.append(row)
+
+    if not items:
         return None, prev_context, header_found
 
-    return {"section_title": title, "metrics": records}, context, header_found
+    values = table.numbers(gather_columns(rows, plan))
+    stride = len(plan.columns)
+    for i, item in enumerate(items):
+        base = i * stride
+        for key, offset, count in plan.groups:
+            if count == 1:
+                item[key] = values[base + offset]
+            else:
+                item[key] = values[base + offset : base + offset + count]
 
+    return {"section_title": title, "metrics": items}, context, header_found
 
-def parse_product_wise_fy_table(
-    matrix: List[List[Any]],
+
+def parse_fy_table(
+    matrix: Matrix,
     prev_context: Optional[Dict[str, Any]],
+    table: Optional[NormalizedTable] = None,
 ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], bool]:
-    header_idx = detect_header_row(matrix)
-    header_found = header_idx is not None
+    return parse_fy_block(matrix, prev_context, FY_TABLE_SPEC, table)
 
-    if header_found:
-        header_row = matrix[header_idx]
-        fy_cols = extract_fy_columns(header_row)
-        if not fy_cols:
-            return None, prev_context, False
-        title = detect_section_title(matrix, header_idx, header_row)
-        start_data_row = header_idx + 1
-        context = {"fy_cols": fy_cols, "title": title}
-    else:
-        if not prev_context:
-            return None, prev_context, False
-        fy_cols = prev_context["fy_cols"]
-        title = prev_context["title"]
-        start_data_row = 0
-        context = prev_context
 
-    records: List[Dict[str, Any]] = []
-
-    for row in matrix[start_data_row:]:
-        if not row:
-            continue
-        code_cell = row[0] if len(row) > 0 else None
-        if code_cell is None or str(code_cell).strip() == "":
-            continue
-        metric = str(code_cell).strip()
-        if metric.upper() in ("PRODUCT (HSN)", "PRODUCT HSN"):
-            continue
-        item: Dict[str, Any] = {"product hsn ": metric}
-        if len(row) > 1:
-            hsn_cell = row[1]
-            if hsn_cell not in (None, "", " "):
-                item["hsn_name"] = str(hsn_cell).strip()
-        for key, col_indexes in fy_cols.items():
-            values: List[Any] = []
-            for col_idx in col_indexes:
-                v = row[col_idx] if col_idx < len(row) else None
-                if v is None or str(v).strip() == "":
-                    values.append(None)
-                else:
-                    values.append(clean_number(v))
-            if not values:
-                item[key] = None
-            elif len(values) == 1:
-                item[key] = values[0]
-            else:
-                item[key] = values
-        records.append(item)
+def parse_state_wise_fy_table(
+    matrix: Matrix,
+    prev_context: Optional[Dict[str, Any]],
+    table: Optional[NormalizedTable] = None,
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], bool]:
+    return parse_fy_block(matrix, prev_context, STATE_WISE_SPEC, table)
 
-    if not records:
-        return None, prev_context, header_found
 
-    return {"section_title": title, "metrics": records}, context, header_found
+def parse_product_wise_fy_table(
+    matrix: Matrix,
+    prev_context: Optional[Dict[str, Any]],
+    table: Optional[NormalizedTable] = None,
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], bool]:
+    return parse_fy_block(matrix, prev_context, PRODUCT_WISE_SPEC, table)
 
 
 def parse_monthly_particulars_table(
-    matrix: List[List[Any]],
+    matrix: Matrix,
     months_context: Optional[List[str]],
+    table: Optional[NormalizedTable] = None,
 ) -> Tuple[Optional[Dict[str, Any]], Optional[List[str]], bool]:
+    if table is None:
+        table = NormalizedTable(matrix)
     header_idx: Optional[int] = None
-    header_row: Optional[List[Any]] = None
+    header_row: Optional[Sequence[Any]] = None
     particulars_col_index: Optional[int] = None
 
     for i, row in enumerate(matrix):
-        if not row:
+        # the joined line contains every cell's text, so it rules rows out
+        if not row or "PARTICULARS" not in table.upper_line(i):
             continue
         for j, cell in enumerate(row):
             if cell is None:
@@ -330,14 +472,15 @@ def parse_monthly_particulars_table(
         and header_row is not None
         and particulars_col_index is not None
     ):
-        months: List[str] = []
-        for cell in header_row[particulars_col_index + 1 :]:
-            if cell in (None, "", " "):
-                continue
-            months.append(str(cell).strip())
+        first_col = particulars_col_index + 1
+        months = [
+            str(cell).strip()
+            for cell in header_row[first_col:]
+            if cell not in (None, "", " ")
+        ]
         if not months:
             return None, months_context, False
-        title = detect_section_title(matrix, header_idx, header_row) or ""
+        title = detect_section_title(matrix, header_idx, header_row, table) or ""
         records: List[Dict[str, Any]] = []
         for row in matrix[header_idx + 1 :]:
             if not row:
@@ -350,15 +493,9 @@ def parse_monthly_particulars_table(
             metric = str(label_cell).strip()
             if metric.upper().startswith("PARTICULARS"):
                 continue
-            monthly_map: Dict[str, Any] = {}
-            for idx, month in enumerate(months):
-                col_idx = particulars_col_index + 1 + idx
-                v = row[col_idx] if col_idx < len(row) else None
-                if v is None or str(v).strip() == "":
-                    val = None
-                else:
-                    val = clean_number(v)
-                monthly_map[month] = val
+            values = table.numbers(row[first_col : first_col + len(months)])
+            values.extend([None] * (len(months) - len(values)))
+            monthly_map: Dict[str, Any] = dict(zip(months, values))
             records.append({"metric": metric, "monthly_values": monthly_map})
         if not records:
             return None, months_context, False
@@ -379,15 +516,9 @@ def parse_monthly_particulars_table(
             metric = str(label_cell).strip()
             if first_label is None:
                 first_label = metric
-            monthly_map: Dict[str, Any] = {}
-            for idx, month in enumerate(months):
-                col_idx = 1 + idx
-                v = row[col_idx] if col_idx < len(row) else None
-                if v is None or str(v).strip() == "":
-                    val = None
-                else:
-                    val = clean_number(v)
-                monthly_map[month] = val
+            values = table.numbers(row[1 : 1 + len(months)])
+            values.extend([None] * (len(months) - len(values)))
+            monthly_map: Dict[str, Any] = dict(zip(months, values))
             records.append({"metric": metric, "monthly_values": monthly_map})
         if not records:
             return None, months_context, False
@@ -397,12 +528,16 @@ def parse_monthly_particulars_table(
     return None, months_context, False
 
 
-def parse_simple_text_table(matrix: List[List[Any]]) -> Optional[Dict[str, Any]]:
+def parse_simple_text_table(
+    matrix: Matrix, table: Optional[NormalizedTable] = None
+) -> Optional[Dict[str, Any]]:
+    if table is None:
+        table = NormalizedTable(matrix)
     non_empty_rows: List[List[Any]] = []
-    for row in matrix:
+    for i, row in enumerate(matrix):
         if not row:
             continue
-        cells = [str(c).strip() for c in row if c not in (None, "", " ")]
+        cells = table.cells(i)
         if cells:
             non_empty_rows.append(cells)
     if not non_empty_rows:
@@ -418,17 +553,21 @@ def parse_simple_text_table(matrix: List[List[Any]]) -> Optional[Dict[str, Any]]
     return {"section_title": title, "metrics": metrics}
 
 
-def first_non_empty_text(matrix: List[List[Any]]) -> Optional[str]:
-    for row in matrix:
+def first_non_empty_text(
+    matrix: Matrix, table: Optional[NormalizedTable] = None
+) -> Optional[str]:
+    if table is None:
+        table = NormalizedTable(matrix)
+    for i, row in enumerate(matrix):
         if not row:
             continue
-        cells = [str(c).strip() for c in row if c not in (None, "", " ")]
+        cells = table.cells(i)
         if cells:
             return " ".join(cells)
     return None
 
 
-def parse_profile_block(matrix: List[List[Any]]) -> Optional[Dict[str, Any]]:
+def parse_profile_block(matrix: Matrix) -> Optional[Dict[str, Any]]:
     profile_row = None
     for i, row in enumerate(matrix):
         if not row:
@@ -467,15 +606,19 @@ def parse_profile_block(matrix: List[List[Any]]) -> Optional[Dict[str, Any]]:
     return {"section_title": "Profile", "metrics": metrics}
 
 
-def parse_filing_block(matrix: List[List[Any]]) -> Optional[Dict[str, Any]]:
+def parse_filing_block(
+    matrix: Matrix, table: Optional[NormalizedTable] = None
+) -> Optional[Dict[str, Any]]:
     if not matrix:
         return None
+    if table is None:
+        table = NormalizedTable(matrix)
     title_idx = None
     title_text = ""
     for i, row in enumerate(matrix):
         if not row:
             continue
-        cells = [str(c).strip() for c in row if c not in (None, "", " ")]
+        cells = table.cells(i)
         if cells:
             title_idx = i
             title_text = " ".join(cells)
@@ -484,11 +627,9 @@ def parse_filing_block(matrix: List[List[Any]]) -> Optional[Dict[str, Any]]:
         return None
     header_idx = None
     for j in range(title_idx + 1, len(matrix)):
-        row = matrix[j]
-        if not row:
+        if not matrix[j]:
             continue
-        cells = [str(c).strip() for c in row if c not in (None, "", " ")]
-        if cells:
+        if table.cells(j):
             header_idx = j
             break
     if header_idx is None:
@@ -523,6 +664,22 @@ def parse_filing_block(matrix: List[List[Any]]) -> Optional[Dict[str, Any]]:
     return {"section_title": title_text, "metrics": records}
 
 
+def table_matrix(t: Dict[str, Any]) -> Any:
+    """
+    Cells of a raw table entry in either raw format: the padded "data" of
+    version 1, or the trimmed "rows" of version 2, padded back out to the
+    entry's column_count in place.
+    """
+    rows = t.get("rows")
+    if not isinstance(rows, list):
+        return t.get("data")
+    width = t.get("column_count") or max(map(len, rows), default=0)
+    for row in rows:
+        if isinstance(row, list) and len(row) < width:
+            row.extend([None] * (width - len(row)))
+    return rows
+
+
 def parse_adjusted_amounts_sheet(
     sheet_name: str, sheet_data: Dict[str, Any]
 ) -> Dict[str, Dict[str, Any]]:
@@ -531,11 +688,14 @@ def parse_adjusted_amounts_sheet(
         return {}
     revenue_idx = None
     purchase_idx = None
+    normalized: Dict[int, NormalizedTable] = {}
+    number_memo: Dict[str, Any] = {}
     for idx, t in enumerate(tables):
-        matrix = t.get("data")
-        if not isinstance(matrix, list) or not matrix:
+        matrix = table_matrix(t)
+        if not isinstance(matrix, (list, CellTable)) or not matrix:
             continue
-        title = first_non_empty_text(matrix) or ""
+        normalized[idx] = NormalizedTable(matrix, number_memo)
+        title = first_non_empty_text(matrix, normalized[idx]) or ""
         up = title.upper()
         if "BIFURCATION OF REVENUE" in up and revenue_idx is None:
             revenue_idx = idx
@@ -543,31 +703,29 @@ def parse_adjusted_amounts_sheet(
             purchase_idx = idx
     if revenue_idx is None and purchase_idx is None:
         return {}
-    revenue_tables: List[Dict[str, Any]] = []
-    purchase_tables: List[Dict[str, Any]] = []
-    for idx, t in enumerate(tables):
+    revenue_tables: List[int] = []
+    purchase_tables: List[int] = []
+    for idx in range(len(tables)):
         if revenue_idx is not None and idx >= revenue_idx and (
             purchase_idx is None or idx < purchase_idx
         ):
-            revenue_tables.append(t)
+            revenue_tables.append(idx)
         if purchase_idx is not None and idx >= purchase_idx:
-            purchase_tables.append(t)
+            purchase_tables.append(idx)
 
     def build_block_with_fy(
-        block_tables: List[Dict[str, Any]],
+        block_tables: List[int],
         default_title: str,
     ) -> Optional[Dict[str, Any]]:
         if not block_tables:
             return None
-        combined: List[List[Any]] = []
-        first_table = block_tables[0]
-        for t in block_tables:
-            matrix = t.get("data")
-            if isinstance(matrix, list) and matrix:
-                combined.extend(matrix)
-        if not combined:
+        first_table = tables[block_tables[0]]
+        parts = [normalized[idx] for idx in block_tables if idx in normalized]
+        if not parts:
             return None
-        parsed_block, _, header_found = parse_fy_table(combined, None)
+        # the block's tables were normalized above; stack them as they are
+        combined = NormalizedTable.concat(parts)
+        parsed_block, _, header_found = parse_fy_table(combined.raw, None, combined)
         if not parsed_block or not header_found:
             return None
         metrics = parsed_block["metrics"]
@@ -600,76 +758,27 @@ def parse_adjusted_amounts_sheet(
 
 
 def parse_partywise_with_gstin(
-    matrix: List[List[Any]],
+    matrix: Matrix,
     prev_context: Optional[Dict[str, Any]],
     role: str,
+    table: Optional[NormalizedTable] = None,
 ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], bool]:
-    header_idx = detect_header_row(matrix)
-    header_found = header_idx is not None
-    if header_found:
-        header_row = matrix[header_idx]
-        fy_cols = extract_fy_columns(header_row)
-        if not fy_cols:
-            return None, prev_context, False
-        title = detect_section_title(matrix, header_idx, header_row)
-        start_data_row = header_idx + 1
-        context = {"fy_cols": fy_cols, "title": title}
-    else:
-        if not prev_context:
-            return None, prev_context, False
-        fy_cols = prev_context["fy_cols"]
-        title = prev_context["title"]
-        start_data_row = 0
-        context = prev_context
-    records: List[Dict[str, Any]] = []
-    name_key = f"{role} name " if role == "customer" else f"{role} name"
-    gstin_key = f"{role}_gstin"
-    for row in matrix[start_data_row:]:
-        if not row:
-            continue
-        name_cell = row[0] if len(row) > 0 else None
-        if name_cell is None or str(name_cell).strip() == "":
-            continue
-        name = str(name_cell).strip()
-        if role == "customer" and "CUSTOMER" in name.upper():
-            continue
-        if role == "supplier" and "SUPPLIER" in name.upper():
-            continue
-        item: Dict[str, Any] = {name_key: name}
-        gstin_cell = row[1] if len(row) > 1 else None
-        if gstin_cell not in (None, "", " "):
-            item[gstin_key] = str(gstin_cell).strip()
-        for key, col_indexes in fy_cols.items():
-            values: List[Any] = []
-            for col_idx in col_indexes:
-                v = row[col_idx] if col_idx < len(row) else None
-                if v is None or str(v).strip() == "":
-                    values.append(None)
-                else:
-                    values.append(clean_number(v))
-            if not values:
-                item[key] = None
-            elif len(values) == 1:
-                item[key] = values[0]
-            else:
-                item[key] = values
-        records.append(item)
-    if not records:
-        return None, prev_context, header_found
-    return {"section_title": title, "metrics": records}, context, header_found
+    return parse_fy_block(matrix, prev_context, party_spec(role), table)
 
 
 def parse_customer_supplier_details_table(
-    matrix: List[List[Any]],
+    matrix: Matrix,
+    table: Optional[NormalizedTable] = None,
 ) -> Optional[Dict[str, Any]]:
     if not matrix:
         return None
+    if table is None:
+        table = NormalizedTable(matrix)
     title_idx = None
     for i, row in enumerate(matrix):
         if not row:
             continue
-        cells = [str(c).strip() for c in row if c not in (None, "", " ")]
-        if cells:
+        if table.cells(i):
             title_idx = i
             break
     if title_idx is None:
@@ -719,15 +828,18 @@ def parse_customer_supplier_details_table(
             records.append(rec)
     if not records:
         return None
-    title_row = matrix[title_idx]
-    title = " ".join(str(c).strip() for c in title_row if c not in (None, "", " "))
+    title = " ".join(table.cells(title_idx))
     return {"section_title": title, "metrics": records}
 
 
-def parse_index_table(matrix: List[List[Any]]) -> Optional[Dict[str, Any]]:
+def parse_index_table(
+    matrix: Matrix, table: Optional[NormalizedTable] = None
+) -> Optional[Dict[str, Any]]:
     if not matrix:
         return None
-    title = first_non_empty_text(matrix) or "Index"
+    if table is None:
+        table = NormalizedTable(matrix)
+    title = first_non_empty_text(matrix, table) or "Index"
     records: List[Dict[str, Any]] = []
     for row in matrix:
         if not row:
@@ -773,123 +885,269 @@ def parse_index_table(matrix: List[List[Any]]) -> Optional[Dict[str, Any]]:
     return {"section_title": title, "metrics": records}
 
 
-def process_workbook_json(path: Path) -> Optional[Dict[str, Any]]:
-    with open(path, "r", encoding="utf-8") as f:
-        wb = json.load(f)
-    sheets = wb.get("sheets", {})
-    output: Dict[str, Any] = {
-        "file_name": wb.get("file_name", path.name),
-        "tables": {},
+def parse_profile_filing_table(
+    matrix: Matrix, table: Optional[NormalizedTable] = None
+) -> Optional[Dict[str, Any]]:
+    if table is None:
+        table = NormalizedTable(matrix)
+    title = first_non_empty_text(matrix, table) or ""
+    low_title = title.lower()
+    if low_title.startswith("profile"):
+        return parse_profile_block(matrix)
+    if "filing details - gstr3b" in low_title:
+        return parse_filing_block(matrix, table)
+    if "filing details - gstr1" in low_title:
+        return parse_filing_block(matrix, table)
+    return parse_simple_text_table(matrix, table)
+
+
+class SheetState:
+    """
+    Parsing state carried from one table to the next within a sheet.
+    """
+
+    def __init__(self) -> None:
+        self.prev_context: Optional[Dict[str, Any]] = None
+        self.months_context: Optional[List[str]] = None
+        self.header_found = False
+        # the table being parsed, normalized once for the whole chain
+        self.table: Optional[NormalizedTable] = None
+
+
+# A table parser takes the table matrix and the sheet state and returns the
+# parsed block or None, setting `state.header_found` as it goes.
+TableParser = Callable[[Matrix, SheetState], Optional[Dict[str, Any]]]
+SheetParser = Callable[[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]
+
+
+def _stateless_step(
+    call: Callable[[Matrix, SheetState], Optional[Dict[str, Any]]]
+) -> TableParser:
+    def step(matrix: Matrix, state: SheetState) -> Optional[Dict[str, Any]]:
+        parsed = call(matrix, state)
+        state.header_found = parsed is not None
+        state.prev_context = None
+        return parsed
+
+    return step
+
+
+def _fy_context_step(
+    call: Callable[
+        [Matrix, SheetState],
+        Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], bool],
+    ]
+) -> TableParser:
+    def step(matrix: Matrix, state: SheetState) -> Optional[Dict[str, Any]]:
+        parsed, state.prev_context, state.header_found = call(matrix, state)
+        return parsed
+
+    return step
+
+
+def stateless_parser(fn: Callable[[Matrix], Optional[Dict[str, Any]]]) -> TableParser:
+    """
+    Adapt a parser that only looks at the matrix. Such a parser starts a
+    new section and breaks any FY header carried over from earlier tables.
+    """
+    return _stateless_step(lambda matrix, state: fn(matrix))
+
+
+def fy_context_parser(
+    fn: Callable[..., Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], bool]],
+    **kwargs: Any,
+) -> TableParser:
+    """
+    Adapt a parser that reuses the FY header of the previous table.
+    """
+    return _fy_context_step(
+        lambda matrix, state: fn(matrix, state.prev_context, **kwargs)
+    )
+
+
+# The built-in parsers also take the table's NormalizedTable, so the
+# per-table text and the workbook number memo are shared between them.
+def _normalized_parser(fn: Callable[..., Optional[Dict[str, Any]]]) -> TableParser:
+    return _stateless_step(lambda matrix, state: fn(matrix, state.table))
+
+
+def _normalized_fy_parser(
+    fn: Callable[..., Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], bool]],
+    **kwargs: Any,
+) -> TableParser:
+    return _fy_context_step(
+        lambda matrix, state: fn(
+            matrix, state.prev_context, table=state.table, **kwargs
+        )
+    )
+
+
+def parse_monthly_step(
+    matrix: Matrix, state: SheetState
+) -> Optional[Dict[str, Any]]:
+    parsed, state.months_context, state.header_found = (
+        parse_monthly_particulars_table(matrix, state.months_context, state.table)
+    )
+    return parsed
+
+
+TABLE_PARSERS: Dict[str, TableParser] = {
+    "monthly_particulars": parse_monthly_step,
+    "fy": _normalized_fy_parser(parse_fy_table),
+    "state_wise_fy": _normalized_fy_parser(parse_state_wise_fy_table),
+    "product_wise_fy": _normalized_fy_parser(parse_product_wise_fy_table),
+    "customer_wise": _normalized_fy_parser(parse_partywise_with_gstin, role="customer"),
+    "supplier_wise": _normalized_fy_parser(parse_partywise_with_gstin, role="supplier"),
+    "profile_filing": _normalized_parser(parse_profile_filing_table),
+    "customer_supplier_details": _normalized_parser(
+        parse_customer_supplier_details_table
+    ),
+    "index": _normalized_parser(parse_index_table),
+    "simple_text": _normalized_parser(parse_simple_text_table),
+}
+
+# (sheet name pattern, parser chain), first match wins. Patterns are
+# fnmatch-style and matched against the stripped, lower-cased sheet name.
+SHEET_PARSERS: List[Tuple[str, List[str]]] = [
+    ("profile & filing*", ["profile_filing"]),
+    ("details of customers and supp.", ["customer_supplier_details", "simple_text"]),
+    ("index", ["index", "simple_text"]),
+    ("gstr 3b", ["monthly_particulars", "fy", "simple_text"]),
+    ("tax", ["monthly_particulars", "fy", "simple_text"]),
+    ("summary", ["monthly_particulars", "fy", "simple_text"]),
+    ("state wise", ["state_wise_fy", "simple_text"]),
+    ("product wise", ["product_wise_fy", "simple_text"]),
+    ("customer wise", ["customer_wise", "fy", "simple_text"]),
+    ("supplier wise", ["supplier_wise", "fy", "simple_text"]),
+]
+DEFAULT_PARSER_CHAIN: List[str] = ["fy", "simple_text"]
+
+# Sheets parsed as a whole rather than table by table.
+SHEET_HANDLERS: List[Tuple[str, str, SheetParser]] = [
+    ("adjusted amounts", "adjusted_amounts", parse_adjusted_amounts_sheet),
+]
+
+
+def register_table_parser(name: str, parser: TableParser) -> None:
+    TABLE_PARSERS[name] = parser
+
+
+def register_sheet_parsers(pattern: str, chain: List[str]) -> None:
+    """
+    Route sheets matching `pattern` to `chain`, ahead of the built-in rules.
+    """
+    unknown = [name for name in chain if name not in TABLE_PARSERS]
+    if unknown:
+        raise KeyError(f"Unknown table parser(s): {', '.join(unknown)}")
+    SHEET_PARSERS.insert(0, (pattern.strip().lower(), list(chain)))
+
+
+def register_sheet_handler(pattern: str, name: str, handler: SheetParser) -> None:
+    SHEET_HANDLERS.insert(0, (pattern.strip().lower(), name, handler))
+
+
+def resolve_sheet_handler(
+    normal_sheet: str,
+) -> Optional[Tuple[str, SheetParser]]:
+    for pattern, name, handler in SHEET_HANDLERS:
+        if fnmatchcase(normal_sheet, pattern):
+            return name, handler
+    return None
+
+
+def resolve_sheet_parsers(normal_sheet: str) -> List[Tuple[str, TableParser]]:
+    chain = DEFAULT_PARSER_CHAIN
+    for pattern, names in SHEET_PARSERS:
+        if fnmatchcase(normal_sheet, pattern):
+            chain = names
+            break
+    return [(name, TABLE_PARSERS[name]) for name in chain]
+
+
+def process_workbook_json(
+    path: Path, stats: Optional[List[Dict[str, Any]]] = None
+) -> Optional[Dict[str, Any]]:
+    wb = load(path)
+    return process_workbook_dict(wb, path.name, stats)
+
+
+def process_workbook_dict(
+    wb: Dict[str, Any],
+    file_name: Optional[str] = None,
+    stats: Optional[List[Dict[str, Any]]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Structure a raw workbook dict. If `stats` is given, one record per
+    parsed table is appended to it, naming the parser that produced it.
+    """
+    tables = dict(iter_structured_tables(wb, stats))
+    if not tables:
+        return None
+    return {
+        "file_name": wb.get("file_name", file_name),
+        "tables": tables,
     }
+
+
+def iter_structured_tables(
+    wb: Dict[str, Any],
+    stats: Optional[List[Dict[str, Any]]] = None,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield (key, table) pairs of the structured output in order, each one
+    as soon as no later table can add metrics to it.
+    """
+    version = wb.get("format_version", DENSE_FORMAT)
+    if version not in RAW_FORMATS:
+        raise ValueError(f"Unsupported raw workbook format_version: {version!r}")
+    sheets = wb.get("sheets", {})
+    all_keys: Set[str] = set()
+    number_memo: Dict[str, Any] = {}
     for sheet_name, sheet_data in sheets.items():
         tables = sheet_data.get("tables", [])
         if not isinstance(tables, list):
             continue
         normal_sheet = sheet_name.strip().lower()
-        if normal_sheet == "adjusted amounts":
-            special_tables = parse_adjusted_amounts_sheet(sheet_name, sheet_data)
-            if special_tables:
-                output["tables"].update(special_tables)
+        sheet_handler = resolve_sheet_handler(normal_sheet)
+        if sheet_handler is not None:
+            handler_name, handler = sheet_handler
+            with timer("parse", sheet_name, handler_name):
+                special_tables = handler(sheet_name, sheet_data)
+            for key, table in special_tables.items():
+                all_keys.add(key)
+                if stats is not None:
+                    stats.append(
+                        {
+                            "sheet": sheet_name,
+                            "table_index": None,
+                            "parser": handler_name,
+                            "key": key,
+                        }
+                    )
+                yield key, table
             continue
-        used_keys: Set[str] = set()
-        prev_context: Optional[Dict[str, Any]] = None
+        parsers = resolve_sheet_parsers(normal_sheet)
         last_key: Optional[str] = None
-        months_context: Optional[List[str]] = None
+        pending: Optional[Dict[str, Any]] = None
+        state = SheetState()
         for t in tables:
-            matrix = t.get("data")
-            if not isinstance(matrix, list) or not matrix:
+            matrix = table_matrix(t)
+            if not isinstance(matrix, (list, CellTable)) or not matrix:
                 continue
             parsed: Optional[Dict[str, Any]] = None
-            header_found = False
-            if normal_sheet.startswith("profile & filing"):
-                title = first_non_empty_text(matrix) or ""
-                low_title = title.lower()
-                if low_title.startswith("profile"):
-                    parsed = parse_profile_block(matrix)
-                elif "filing details - gstr3b" in low_title:
-                    parsed = parse_filing_block(matrix)
-                elif "filing details - gstr1" in low_title:
-                    parsed = parse_filing_block(matrix)
-                else:
-                    parsed = parse_simple_text_table(matrix)
-                header_found = parsed is not None
-                prev_context = None
-            elif normal_sheet == "details of customers and supp.":
-                parsed = parse_customer_supplier_details_table(matrix)
-                if not parsed:
-                    parsed = parse_simple_text_table(matrix)
-                header_found = parsed is not None
-                prev_context = None
-            elif normal_sheet == "index":
-                parsed = parse_index_table(matrix)
-                if not parsed:
-                    parsed = parse_simple_text_table(matrix)
-                header_found = parsed is not None
-                prev_context = None
-            else:
-                if normal_sheet in ("gstr 3b", "tax", "summary"):
-                    parsed, months_context, header_found = parse_monthly_particulars_table(
-                        matrix, months_context
-                    )
-                    if not parsed:
-                        parsed, prev_context, header_found = parse_fy_table(
-                            matrix, prev_context
-                        )
-                        if not parsed:
-                            parsed = parse_simple_text_table(matrix)
-                            header_found = parsed is not None
-                            prev_context = None
-                elif normal_sheet == "state wise":
-                    parsed, prev_context, header_found = parse_state_wise_fy_table(
-                        matrix, prev_context
-                    )
-                    if not parsed:
-                        parsed = parse_simple_text_table(matrix)
-                        header_found = parsed is not None
-                        prev_context = None
-                elif normal_sheet == "product wise":
-                    parsed, prev_context, header_found = parse_product_wise_fy_table(
-                        matrix, prev_context
-                    )
-                    if not parsed:
-                        parsed = parse_simple_text_table(matrix)
-                        header_found = parsed is not None
-                        prev_context = None
-                elif normal_sheet == "customer wise":
-                    parsed, prev_context, header_found = parse_partywise_with_gstin(
-                        matrix, prev_context, role="customer"
-                    )
-                    if not parsed:
-                        parsed, prev_context, header_found = parse_fy_table(
-                            matrix, prev_context
-                        )
-                        if not parsed:
-                            parsed = parse_simple_text_table(matrix)
-                            header_found = parsed is not None
-                            prev_context = None
-                elif normal_sheet == "supplier wise":
-                    parsed, prev_context, header_found = parse_partywise_with_gstin(
-                        matrix, prev_context, role="supplier"
-                    )
-                    if not parsed:
-                        parsed, prev_context, header_found = parse_fy_table(
-                            matrix, prev_context
-                        )
-                        if not parsed:
-                            parsed = parse_simple_text_table(matrix)
-                            header_found = parsed is not None
-                            prev_context = None
-                else:
-                    parsed, prev_context, header_found = parse_fy_table(
-                        matrix, prev_context
-                    )
-                    if not parsed:
-                        parsed = parse_simple_text_table(matrix)
-                        header_found = parsed is not None
-                        prev_context = None
+            parser_name: Optional[str] = None
+            state.table = NormalizedTable(matrix, number_memo)
+            for name, parser in parsers:
+                with timer("parse", sheet_name, name):
+                    parsed = parser(matrix, state)
+                if parsed:
+                    parser_name = name
+                    break
             if not parsed:
                 continue
-            if header_found or last_key is None:
+            if state.header_found or last_key is None:
+                if pending is not None and last_key is not None:
+                    yield last_key, pending
                 section_title = (
                     parsed.get("section_title") or f"table_{t.get('table_index')}"
                 )
@@ -897,12 +1155,12 @@ def process_workbook_json(path: Path) -> Optional[Dict[str, Any]]:
                 base_key = f"{sheet_name}_{section_slug}"
                 key = base_key
                 idx = 2
-                while key in used_keys or key in output["tables"]:
+                while key in all_keys:
                     key = f"{base_key}_{idx}"
                     idx += 1
-                used_keys.add(key)
+                all_keys.add(key)
                 last_key = key
-                output["tables"][key] = {
+                pending = {
                     "sheet": sheet_name,
                     "section_title": section_title,
                     "start_row": t.get("start_row"),
@@ -912,14 +1170,56 @@ def process_workbook_json(path: Path) -> Optional[Dict[str, Any]]:
                     "metrics": parsed["metrics"],
                 }
             else:
-                if last_key is not None:
-                    output["tables"][last_key]["metrics"].extend(parsed["metrics"])
-    if not output["tables"]:
-        return None
-    return output
+                if pending is not None:
+                    pending["metrics"].extend(parsed["metrics"])
+            if stats is not None:
+                stats.append(
+                    {
+                        "sheet": sheet_name,
+                        "table_index": t.get("table_index"),
+                        "parser": parser_name,
+                        "key": last_key,
+                    }
+                )
+        if pending is not None and last_key is not None:
+            yield last_key, pending
+
+
+def write_structured_json(
+    fp: IO[str],
+    file_name: Optional[str],
+    tables: Iterable[Tuple[str, Dict[str, Any]]],
+    indent: Optional[int] = 2,
+) -> int:
+    return write_json_stream(fp, {"file_name": file_name}, "tables", tables, indent)
+
+
+def convert_workbook_json(
+    path: Path, indent: Optional[int] = 2
+) -> Tuple[int, Optional[Path]]:
+    wb = load(path)
+    file_name = wb.get("file_name", path.name)
+    counterparties: Counterparties = {}
+    tables = tap_counterparties(iter_structured_tables(wb), counterparties)
+    first = next(tables, None)
+    out_path = None
+    if first is not None:
+        out_path = OUTPUT_DIR / f"structured_{path.name}"
+        with open_for_replace(out_path) as f:
+            write_structured_json(f, file_name, chain([first], tables), indent)
+    with GstinIndex(OUTPUT_DIR / GSTIN_INDEX_NAME) as index:
+        index.update_report(report_id(path), counterparties)
+    return count_rows(wb), out_path
+
 
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Transform workbook JSON into structured JSON."
+    )
+    add_batch_args(parser)
+    add_profile_args(parser)
+    args = parser.parse_args(argv)
 
-def main():
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     workbook_jsons = sorted(
         p for p in OUTPUT_DIR.glob("*.json") if not p.name.startswith("structured_")
@@ -927,16 +1227,19 @@ def main():
     if not workbook_jsons:
         print("[ERROR] No workbook JSON files found.")
         return
-    for path in workbook_jsons:
-        print(f"[INFO] Processing: {path.name}")
-        structured = process_workbook_json(path)
-        if structured is None:
-            print(f"[WARN] No tables parsed in: {path.name}")
-            continue
-        out_path = OUTPUT_DIR / f"structured_{path.name}"
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(structured, f, indent=2, ensure_ascii=False)
-        print(f"[OK] {out_path}")
+    task = partial(convert_workbook_json, indent=None if args.compact else 2)
+    with profile_from_args(args):
+        if args.incremental:
+            run_incremental_batch(
+                task,
+                workbook_jsons,
+                args.workers,
+                OUTPUT_DIR / MANIFEST_NAME,
+                output_version(PARSER_VERSION, "compact" if args.compact else ""),
+                on_prune=partial(prune_reports, OUTPUT_DIR / GSTIN_INDEX_NAME),
+            )
+        else:
+            run_batch(task, workbook_jsons, args.workers)
     print("[DONE]")
 
 
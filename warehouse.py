@@ -0,0 +1,272 @@
+import argparse
+import sqlite3
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from batch import run_batch
+from json_writer import load
+from parquet_export import flatten_structured
+from transform_sections import OUTPUT_DIR, PARSER_VERSION
+
+WAREHOUSE_PATH = OUTPUT_DIR / "warehouse.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    source_file TEXT NOT NULL UNIQUE,
+    file_name TEXT,
+    parser_version TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY,
+    report_id INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    table_key TEXT NOT NULL,
+    sheet TEXT,
+    section_title TEXT,
+    family TEXT,
+    row_count INTEGER
+);
+CREATE TABLE IF NOT EXISTS metric_values (
+    report_id INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    section_id INTEGER NOT NULL REFERENCES sections(id) ON DELETE CASCADE,
+    row INTEGER NOT NULL,
+    metric TEXT,
+    role TEXT,
+    gstin TEXT,
+    hsn TEXT,
+    state_code TEXT,
+    period TEXT,
+    position INTEGER,
+    value REAL,
+    text TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sections_report ON sections(report_id);
+CREATE INDEX IF NOT EXISTS idx_values_report ON metric_values(report_id);
+CREATE INDEX IF NOT EXISTS idx_values_section ON metric_values(section_id);
+CREATE INDEX IF NOT EXISTS idx_values_gstin ON metric_values(gstin);
+CREATE INDEX IF NOT EXISTS idx_values_hsn ON metric_values(hsn);
+CREATE INDEX IF NOT EXISTS idx_values_state ON metric_values(state_code);
+CREATE INDEX IF NOT EXISTS idx_values_period ON metric_values(period);
+"""
+
+VALUE_COLUMNS = (
+    "row", "metric", "role", "gstin", "hsn", "state_code",
+    "period", "position", "value", "text",
+)
+
+INSERT_VALUES = (
+    "INSERT INTO metric_values (report_id, section_id, "
+    + ", ".join(VALUE_COLUMNS)
+    + ") VALUES (?, ?, " + ", ".join("?" * len(VALUE_COLUMNS)) + ")"
+)
+
+
+def iter_value_rows(family: str, columns: Dict[str, List[Any]]) -> Iterator[Tuple]:
+    """
+    (table_key, *VALUE_COLUMNS) rows from one family of
+    `flatten_structured`, mapped onto the shared metric_values layout.
+    """
+    n = len(columns["table_key"])
+
+    def col(name: str) -> List[Any]:
+        return columns.get(name) or [None] * n
+
+    if family == "party_gstin":
+        metric = col("party_name")
+    elif family == "product_hsn":
+        metric = col("hsn_name")
+    elif family == "profile_filing":
+        metric = col("field")
+    else:
+        metric = col("metric")
+    if family == "profile_filing":
+        value, text = [None] * n, col("value")
+    else:
+        value, text = col("value"), col("text")
+
+    return zip(
+        col("table_key"), col("row"), metric, col("role"), col("gstin"),
+        col("hsn"), col("state_code"), col("period"), col("position"),
+        value, text,
+    )
+
+
+class Warehouse:
+    """
+    SQLite store of structured results: one row per report, per section
+    (table) and per tidy metric value, indexed for cross-report lookups.
+    """
+
+    def __init__(self, path: Path = WAREHOUSE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "Warehouse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def ingest(self, structured: Dict[str, Any], source_file: str) -> int:
+        """
+        Replace the report `source_file` with `structured` in one
+        transaction. Returns the number of metric values stored.
+        """
+        tables = structured.get("tables", {})
+        flat = flatten_structured(structured)
+        family_of = {
+            key: family
+            for family, columns in flat.items()
+            for key in set(columns["table_key"])
+        }
+
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM reports WHERE source_file = ?", (source_file,)
+            )
+            report_id = self.conn.execute(
+                "INSERT INTO reports (source_file, file_name, parser_version) "
+                "VALUES (?, ?, ?)",
+                (source_file, structured.get("file_name"), PARSER_VERSION),
+            ).lastrowid
+
+            self.conn.executemany(
+                "INSERT INTO sections (report_id, table_key, sheet, "
+                "section_title, family, row_count) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        report_id,
+                        key,
+                        t.get("sheet"),
+                        t.get("section_title"),
+                        family_of.get(key),
+                        t.get("row_count"),
+                    )
+                    for key, t in tables.items()
+                ),
+            )
+            section_ids = dict(
+                self.conn.execute(
+                    "SELECT table_key, id FROM sections WHERE report_id = ?",
+                    (report_id,),
+                )
+            )
+
+            count = 0
+            for family, columns in flat.items():
+                rows = [
+                    (report_id, section_ids[r[0]]) + r[1:]
+                    for r in iter_value_rows(family, columns)
+                ]
+                self.conn.executemany(INSERT_VALUES, rows)
+                count += len(rows)
+        return count
+
+    def query(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        cur = self.conn.cursor()
+        cur.row_factory = sqlite3.Row
+        return cur.execute(sql, params).fetchall()
+
+    def reports(self) -> List[str]:
+        return [
+            r[0]
+            for r in self.conn.execute("SELECT source_file FROM reports ORDER BY id")
+        ]
+
+    def _values_where(self, where: str, params: Tuple) -> List[sqlite3.Row]:
+        return self.query(
+            "SELECT r.source_file, s.table_key, v.row, v.metric, v.role, "
+            "v.gstin, v.hsn, v.state_code, v.period, v.position, v.value, "
+            "v.text FROM metric_values v "
+            "JOIN reports r ON r.id = v.report_id "
+            "JOIN sections s ON s.id = v.section_id "
+            f"WHERE {where} ORDER BY r.source_file, s.id, v.row",
+            params,
+        )
+
+    def find_gstin(
+        self, gstin: str, role: Optional[str] = None, period: Optional[str] = None
+    ) -> List[sqlite3.Row]:
+        """
+        Values of every report where `gstin` appears as a counterparty,
+        optionally limited to role ("customer"/"supplier") and period.
+        """
+        where, params = "v.gstin = ?", [gstin.strip().upper()]
+        if role is not None:
+            where += " AND v.role = ?"
+            params.append(role)
+        if period is not None:
+            where += " AND v.period = ?"
+            params.append(period)
+        return self._values_where(where, tuple(params))
+
+    def reports_with_gstin(self, gstin: str, role: Optional[str] = None) -> List[str]:
+        return sorted({r["source_file"] for r in self.find_gstin(gstin, role)})
+
+    def find_hsn(self, hsn: str, period: Optional[str] = None) -> List[sqlite3.Row]:
+        where, params = "v.hsn = ?", [hsn.strip()]
+        if period is not None:
+            where += " AND v.period = ?"
+            params.append(period)
+        return self._values_where(where, tuple(params))
+
+    def find_state(
+        self, state_code: str, period: Optional[str] = None
+    ) -> List[sqlite3.Row]:
+        where, params = "v.state_code = ?", [state_code.strip()]
+        if period is not None:
+            where += " AND v.period = ?"
+            params.append(period)
+        return self._values_where(where, tuple(params))
+
+
+def ingest_structured_json(
+    path: Path, db_path: Path = WAREHOUSE_PATH
+) -> Tuple[int, Optional[Path]]:
+    structured = load(path)
+    source_file = path.name[len("structured_"):]
+    with Warehouse(db_path) as wh:
+        count = wh.ingest(structured, source_file)
+    return count, db_path
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Load structured JSON into a SQLite warehouse and query it."
+    )
+    parser.add_argument(
+        "--db", type=Path, default=WAREHOUSE_PATH, help="SQLite database path"
+    )
+    parser.add_argument(
+        "--gstin", help="list the reports a GSTIN appears in instead of ingesting"
+    )
+    args = parser.parse_args(argv)
+
+    if args.gstin:
+        with Warehouse(args.db) as wh:
+            for row in wh.find_gstin(args.gstin):
+                print(
+                    f"{row['source_file']}\t{row['role']}\t{row['metric']}\t"
+                    f"{row['period']}\t{row['value']}"
+                )
+        return
+
+    structured_jsons = sorted(OUTPUT_DIR.glob("structured_*.json"))
+    if not structured_jsons:
+        print("[ERROR] No structured JSON files found.")
+        return
+    # SQLite allows one writer at a time, so reports are ingested serially
+    run_batch(partial(ingest_structured_json, db_path=args.db), structured_jsons)
+    print("[DONE]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import io
+import math
+from pathlib import Path
+from typing import Any, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from openpyxl.workbook.workbook import Workbook
+
+from cell_table import CellTable
+from profiling import count, timed_iter, timer
+
+# Strings pandas.read_excel turns into NaN by default.
+PANDAS_NA_TOKENS = frozenset(
+    {
+        "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+        "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+        "n/a", "nan", "null",
+    }
+)
+
+
+class TableBlock(NamedTuple):
+    """
+    One block of non-empty rows. Row/column positions are 0-based.
+    """
+
+    start_row: int
+    start_col: int
+    end_row: int
+    end_col: int
+    rows: CellTable
+
+
+def open_workbook(source: Union[Path, str, bytes]) -> Workbook:
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    with timer("load", name="xlsx"):
+        return load_workbook(
+            source, read_only=True, data_only=True, keep_links=False
+        )
+
+
+def is_blank(v: Any) -> bool:
+    if v is None:
+        return True
+    if isinstance(v, float) and math.isnan(v):
+        return True
+    if isinstance(v, str) and v.strip() == "":
+        return True
+    return False
+
+
+def pandas_cell_value(cell: Any) -> Any:
+    """
+    Cell value as pandas.read_excel(header=None) would report it.
+    """
+    value = cell.value
+    if value is None:
+        return None
+    if cell.data_type == TYPE_ERROR:
+        return None
+    if cell.data_type == TYPE_NUMERIC:
+        as_int = int(value)
+        if as_int == value:
+            return as_int
+        return float(value)
+    if isinstance(value, str) and value in PANDAS_NA_TOKENS:
+        return None
+    return value
+
+
+def _make_block(
+    start_row: int, rows: List[Sequence[Any]], drop_empty_columns: bool
+) -> Optional[TableBlock]:
+    if drop_empty_columns:
+        # keep every column holding a value, like DataFrame.dropna(axis=1)
+        cols = sorted(
+            {j for row in rows for j, v in enumerate(row) if v is not None}
+        )
+    else:
+        # keep the contiguous span between the outermost non-blank cells
+        used = [j for row in rows for j, v in enumerate(row) if not is_blank(v)]
+        cols = list(range(min(used), max(used) + 1)) if used else []
+    if not cols:
+        return None
+    if cols[0] == 0 and cols[-1] == len(cols) - 1:
+        data = CellTable((row[: len(cols)] for row in rows), len(cols))
+    else:
+        data = CellTable(
+            ([row[j] if j < len(row) else None for j in cols] for row in rows),
+            len(cols),
+        )
+    count("tables")
+    count("rows", len(data))
+    count("cells", len(data) * len(cols))
+    return TableBlock(
+        start_row, cols[0], start_row + len(rows) - 1, cols[-1], data
+    )
+
+
+def iter_sheet_tables(
+    ws: Any,
+    pandas_values: bool = False,
+    drop_empty_columns: bool = False,
+) -> Iterator[TableBlock]:
+    """
+    Stream the blocks of a worksheet separated by fully empty rows.
+
+    Only the rows of the block being collected are kept in memory; each
+    block is yielded as soon as the blank row closing it is read.
+    """
+    if not hasattr(ws, "iter_rows"):
+        return
+    if getattr(ws, "reset_dimensions", None) is not None:
+        # read-only sheets may carry a stale <dimension> element
+        ws.reset_dimensions()
+
+    current: List[Sequence[Any]] = []
+    current_start = 0
+
+    if pandas_values:
+        row_iter = (
+            [pandas_cell_value(c) for c in row] for row in ws.iter_rows()
+        )
+    else:
+        row_iter = ws.iter_rows(values_only=True)
+
+    # openpyxl parses the sheet XML lazily, as the rows are pulled
+    for idx, row in enumerate(timed_iter(row_iter, "read", ws.title)):
+        if all(is_blank(v) for v in row):
+            if current:
+                block = _make_block(current_start, current, drop_empty_columns)
+                if block is not None:
+                    yield block
+                current = []
+        else:
+            if not current:
+                current_start = idx
+            current.append(row)
+
+    if current:
+        block = _make_block(current_start, current, drop_empty_columns)
+        if block is not None:
+            yield block